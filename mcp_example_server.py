@@ -7,10 +7,25 @@ The server exposes tools that the AI assistant can use.
 """
 
 import json
+import os
 import sys
 from typing import Any, Dict, List, Optional
 from pathlib import Path
 
+try:
+    import orjson
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+except ImportError:
+    # The standard library is slower but produces the same messages
+    _loads = json.loads
+
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode()
+
+# Bytes read from stdin per system call
+READ_SIZE = 65536
+
 
 class MCPServer:
     """
@@ -59,31 +74,41 @@ class MCPServer:
                 }
             }
         }
+        
+        # Request methods and tool implementations, keyed by name; tools
+        # receive the call's arguments dict
+        self._methods = {
+            "tools/list": self._list_tools,
+            "tools/call": self._call_tool,
+        }
+        self._handlers = {
+            "get_fine_count": lambda arguments: self._get_fine_count(),
+            "search_fines": lambda arguments: self._search_fines(arguments.get("query", "")),
+            "get_pdf_info": lambda arguments: self._get_pdf_info(arguments.get("pdf_path", "")),
+        }
     
     def handle_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
         """Handle an MCP request."""
         method = request.get("method")
         params = request.get("params", {})
-        
-        if method == "tools/list":
-            return {
-                "tools": list(self.tools.values())
-            }
-        
-        elif method == "tools/call":
-            tool_name = params.get("name")
-            arguments = params.get("arguments", {})
-            
-            if tool_name == "get_fine_count":
-                return self._get_fine_count()
-            elif tool_name == "search_fines":
-                return self._search_fines(arguments.get("query", ""))
-            elif tool_name == "get_pdf_info":
-                return self._get_pdf_info(arguments.get("pdf_path", ""))
-            else:
-                return {"error": f"Unknown tool: {tool_name}"}
-        
-        return {"error": f"Unknown method: {method}"}
+        handler = self._methods.get(method)
+        if handler is None:
+            return {"error": f"Unknown method: {method}"}
+        return handler(params)
+    
+    def _list_tools(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Handle tools/list."""
+        return {
+            "tools": list(self.tools.values())
+        }
+    
+    def _call_tool(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Handle tools/call by looking the tool up in the handler table."""
+        tool_name = params.get("name")
+        handler = self._handlers.get(tool_name)
+        if handler is None:
+            return {"error": f"Unknown tool: {tool_name}"}
+        return handler(params.get("arguments", {}))
     
     def _get_fine_count(self) -> Dict[str, Any]:
         """Implementation of get_fine_count tool."""
@@ -112,39 +137,67 @@ class MCPServer:
     
     def _get_pdf_info(self, pdf_path: str) -> Dict[str, Any]:
         """Implementation of get_pdf_info tool."""
-        path = Path(pdf_path)
-        if path.exists():
+        try:
+            # One stat call both checks for the file and gets its size
+            size = os.stat(pdf_path).st_size
+        except OSError:
             return {
                 "content": [{
                     "type": "text",
-                    "text": f"PDF: {path.name}\nSize: {path.stat().st_size} bytes\nExists: True"
+                    "text": f"PDF not found: {pdf_path}"
                 }]
             }
         return {
             "content": [{
                 "type": "text",
-                "text": f"PDF not found: {pdf_path}"
+                "text": f"PDF: {Path(pdf_path).name}\nSize: {size} bytes\nExists: True"
             }]
         }
 
 
+def _read_request_batches(fd: int):
+    """
+    Yield lists of request lines, one list per read from the file descriptor.
+
+    os.read returns whatever is already available, so each batch holds every
+    complete line received so far and the next read only blocks once the
+    client has nothing more queued.
+    """
+    pending = b""
+    while True:
+        chunk = os.read(fd, READ_SIZE)
+        if not chunk:
+            break
+        *lines, pending = (pending + chunk).split(b"\n")
+        if lines:
+            yield lines
+    if pending.strip():
+        yield [pending]
+
+
 def main():
     """Main entry point for the MCP server (stdio transport)."""
     server = MCPServer()
+    stdout = sys.stdout.buffer
     
-    # Read from stdin, write to stdout (stdio transport)
-    for line in sys.stdin:
-        try:
-            request = json.loads(line.strip())
-            response = server.handle_request(request)
-            print(json.dumps(response))
-            sys.stdout.flush()
-        except json.JSONDecodeError:
-            continue
-        except Exception as e:
-            error_response = {"error": str(e)}
-            print(json.dumps(error_response))
-            sys.stdout.flush()
+    # Read from stdin, write to stdout (stdio transport); responses to a
+    # batch of requests go out in one write and one flush
+    for lines in _read_request_batches(sys.stdin.fileno()):
+        responses = []
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                request = _loads(line)
+                responses.append(_dumps(server.handle_request(request)))
+            except json.JSONDecodeError:  # orjson's error subclasses this
+                continue
+            except Exception as e:
+                responses.append(_dumps({"error": str(e)}))
+        if responses:
+            responses.append(b"")
+            stdout.write(b"\n".join(responses))
+            stdout.flush()
 
 
 if __name__ == "__main__":
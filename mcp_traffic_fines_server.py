@@ -17,13 +17,18 @@ To use this in Cursor:
 """
 
 import sys
+import os
 import json
+import asyncio
+import threading
 from pathlib import Path
 
 # Add src to Python path
 project_root = Path(__file__).parent
 src_path = project_root / "src"
 sys.path.insert(0, str(src_path))
+# Relative pdf_path arguments are resolved against this
+_PROJECT_ROOT = str(project_root)
 
 try:
     from mcp.server import Server
@@ -33,10 +38,16 @@ except ImportError:
     print("Error: MCP SDK not installed. Run: pip install mcp", file=sys.stderr)
     sys.exit(1)
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Import your application modules
 try:
     from trafficfines.db.models import FineModel
-    from trafficfines.pdf.parser import PDFParser
+    from trafficfines.pdf.parser import PARSE_WORKERS, PDFParser, create_parse_executor, parse_pdf_file
+    from trafficfines.utils.pdf_cache import get_pdf_cache
 except ImportError as e:
     print(f"Error importing application modules: {e}", file=sys.stderr)
     print("Make sure you're running from the project root", file=sys.stderr)
@@ -45,6 +56,40 @@ except ImportError as e:
 app = Server("traffic-fines-etl")
 
 
+def _json_default(value):
+    """JSON fallback for values like dates: ISO 8601 where possible, else str()"""
+    isoformat = getattr(value, "isoformat", None)
+    return isoformat() if isoformat is not None else str(value)
+
+
+def _dumps(obj, indent=False) -> str:
+    """
+    Serialise a tool result, with orjson when it is installed.
+    
+    Output is compact unless indent is set; the whitespace means nothing to
+    the client and only adds bytes to the pipe.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=_json_default, option=orjson.OPT_INDENT_2 if indent else 0).decode()
+    if indent:
+        return json.dumps(obj, indent=2, default=_json_default)
+    return json.dumps(obj, separators=(",", ":"), default=_json_default)
+
+
+# get_all_fines page size when the caller gives no limit, and the largest
+# one it accepts
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+# Longest JSON payload returned in one response; the rest is left for the
+# next page
+MAX_RESPONSE_CHARS = 50_000
+
+# Shared by every tool call. FineModel hands each thread its own reused
+# connection, so nothing is opened per call.
+MODEL = FineModel()
+PARSER = PDFParser()
+
+
 @app.list_tools()
 async def list_tools() -> list[Tool]:
     """List all available tools."""
@@ -117,15 +162,20 @@ async def list_tools() -> list[Tool]:
         ),
         Tool(
             name="get_all_fines",
-            description="Get all traffic fines from the database, ordered by violation date",
+            description="Get traffic fines from the database, ordered by violation date, one page at a time",
             inputSchema={
                 "type": "object",
                 "properties": {
                     "limit": {
                         "type": "integer",
-                        "description": "Maximum number of fines to return (optional)",
+                        "description": f"Maximum number of fines to return (optional, default {DEFAULT_PAGE_SIZE})",
                         "minimum": 1,
-                        "maximum": 1000
+                        "maximum": MAX_PAGE_SIZE
+                    },
+                    "offset": {
+                        "type": "integer",
+                        "description": "Number of fines to skip, for fetching later pages (optional, default 0)",
+                        "minimum": 0
                     }
                 }
             }
@@ -133,17 +183,46 @@ async def list_tools() -> list[Tool]:
     ]
 
 
+# Process pool for parse_pdf, started on the first parse so PDF parsing is
+# not serialised by the GIL with the other tool calls
+_parse_executor = None
+_parse_executor_lock = threading.Lock()
+
+
+def _get_parse_executor():
+    """Get or create the process pool that parse_pdf runs in"""
+    global _parse_executor
+    
+    if _parse_executor is None:
+        with _parse_executor_lock:
+            if _parse_executor is None:
+                _parse_executor = create_parse_executor(
+                    PARSE_WORKERS, PARSER.jurisdiction, PARSER.strict_validation
+                )
+    
+    return _parse_executor
+
+
 @app.call_tool()
 async def call_tool(name: str, arguments: dict) -> list[TextContent]:
-    """Handle tool calls."""
+    """
+    Handle tool calls.
+    
+    The tools do blocking database and file I/O, so they run in a worker
+    thread and the event loop stays free to serve other requests.
+    """
+    return await asyncio.to_thread(_call_tool, name, arguments)
+
+
+def _call_tool(name: str, arguments: dict) -> list[TextContent]:
+    """Run a tool call; executed outside the event loop."""
     try:
-        model = FineModel()
+        model = MODEL
         
         if name == "get_fine_count":
-            fines = model.get_all_fines()
             return [TextContent(
                 type="text",
-                text=f"Total fines in database: {len(fines)}"
+                text=f"Total fines in database: {model.count_fines()}"
             )]
         
         elif name == "get_fine_by_number":
@@ -151,20 +230,13 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
             if not fine_number:
                 return [TextContent(type="text", text="Error: fine_number is required")]
             
-            fine = model.get_fine_by_number(fine_number)
+            fine = model.get_fine_summary_by_number(fine_number)
             if fine:
                 # Format fine data nicely
-                fine_dict = {
-                    "fine_number": fine.fine_number,
-                    "license_plate": fine.license_plate,
-                    "violation_date": fine.violation_date,
-                    "amount": fine.amount,
-                    "description": fine.description,
-                    "violation_location": fine.violation_location
-                }
+                fine_dict = dict(fine)
                 return [TextContent(
                     type="text",
-                    text=json.dumps(fine_dict, indent=2, default=str)
+                    text=_dumps(fine_dict)
                 )]
             else:
                 return [TextContent(
@@ -177,22 +249,21 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
             if not license_plate:
                 return [TextContent(type="text", text="Error: license_plate is required")]
             
-            all_fines = model.get_all_fines()
-            matching_fines = [f for f in all_fines if f.license_plate == license_plate]
+            matching_fines = model.get_fines_by_plate(license_plate)
             
             if matching_fines:
                 result = []
                 for fine in matching_fines:
                     result.append({
-                        "fine_number": fine.fine_number,
-                        "violation_date": fine.violation_date,
-                        "amount": fine.amount,
-                        "description": fine.description
+                        "fine_number": fine['fine_number'],
+                        "violation_date": fine['violation_date'],
+                        "amount": fine['amount'],
+                        "description": fine['description']
                     })
                 return [TextContent(
                     type="text",
                     text=f"Found {len(matching_fines)} fine(s) for plate {license_plate}:\n\n" +
-                         json.dumps(result, indent=2, default=str)
+                         _dumps(result)
                 )]
             else:
                 return [TextContent(
@@ -206,22 +277,29 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
                 return [TextContent(type="text", text="Error: pdf_path is required")]
             
             # Resolve path (handle relative paths)
-            path = Path(pdf_path)
-            if not path.is_absolute():
-                path = project_root / path
-            
-            if not path.exists():
-                return [TextContent(
-                    type="text",
-                    text=f"Error: PDF file not found: {path}"
-                )]
+            path = pdf_path if os.path.isabs(pdf_path) else os.path.join(_PROJECT_ROOT, pdf_path)
             
             try:
-                parser = PDFParser()
-                result = parser.parse_pdf(str(path), validate=False)
+                # Repeated questions about an unchanged file skip the parse;
+                # a hit costs a single stat, so existence is only checked on a miss
+                parser = PARSER
+                cache = get_pdf_cache()
+                result = cache.get(path, parser.jurisdiction)
+                if result is None:
+                    if not os.path.exists(path):
+                        return [TextContent(
+                            type="text",
+                            text=f"Error: PDF file not found: {path}"
+                        )]
+                    result = _get_parse_executor().submit(
+                        parse_pdf_file, path, parser.jurisdiction, parser.strict_validation, validate=False
+                    ).result()
+                    if result is not None:
+                        cache.put(path, result, parser.jurisdiction)
+                # Parsed PDFs stay indented, as they are often read by people
                 return [TextContent(
                     type="text",
-                    text=json.dumps(result, indent=2, default=str)
+                    text=_dumps(result, indent=True)
                 )]
             except Exception as e:
                 return [TextContent(
@@ -235,15 +313,15 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
                 result = []
                 for fine in unpaid:
                     result.append({
-                        "fine_number": fine.fine_number,
-                        "license_plate": fine.license_plate,
-                        "amount": fine.amount,
-                        "defense_due_date": fine.defense_due_date
+                        "fine_number": fine['fine_number'],
+                        "license_plate": fine['license_plate'],
+                        "amount": fine['amount'],
+                        "defense_due_date": fine['defense_due_date']
                     })
                 return [TextContent(
                     type="text",
                     text=f"Found {len(unpaid)} unpaid fine(s):\n\n" +
-                         json.dumps(result, indent=2, default=str)
+                         _dumps(result)
                 )]
             else:
                 return [TextContent(
@@ -257,14 +335,14 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
                 result = []
                 for fine in needing_id:
                     result.append({
-                        "fine_number": fine.fine_number,
-                        "license_plate": fine.license_plate,
-                        "driver_id_due_date": fine.driver_id_due_date
+                        "fine_number": fine['fine_number'],
+                        "license_plate": fine['license_plate'],
+                        "driver_id_due_date": fine['driver_id_due_date']
                     })
                 return [TextContent(
                     type="text",
                     text=f"Found {len(needing_id)} fine(s) needing driver ID reminders:\n\n" +
-                         json.dumps(result, indent=2, default=str)
+                         _dumps(result)
                 )]
             else:
                 return [TextContent(
@@ -273,26 +351,45 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
                 )]
         
         elif name == "get_all_fines":
-            limit = arguments.get("limit")
-            all_fines = model.get_all_fines()
+            # The schema's bounds are not enforced by the client, so clamp here
+            limit = max(1, min(int(arguments.get("limit") or DEFAULT_PAGE_SIZE), MAX_PAGE_SIZE))
+            offset = max(0, int(arguments.get("offset") or 0))
             
-            if limit:
-                all_fines = all_fines[:limit]
+            page = model.get_fines_page(limit, offset)
+            if not page:
+                return [TextContent(
+                    type="text",
+                    text=f"No fines found from offset {offset}"
+                )]
             
             result = []
-            for fine in all_fines:
+            for fine in page:
                 result.append({
-                    "fine_number": fine.fine_number,
-                    "license_plate": fine.license_plate,
-                    "violation_date": fine.violation_date,
-                    "amount": fine.amount,
-                    "description": fine.description
+                    "fine_number": fine['fine_number'],
+                    "license_plate": fine['license_plate'],
+                    "violation_date": fine['violation_date'],
+                    "amount": fine['amount'],
+                    "description": fine['description']
                 })
             
+            # Keep whole rows so the payload stays valid JSON: drop rows from
+            # the end until it fits, always returning at least one
+            size = 2
+            for count, row in enumerate(result):
+                size += len(_dumps(row)) + 1
+                if size > MAX_RESPONSE_CHARS and count > 0:
+                    break
+            else:
+                count = len(result)
+            truncated = count < len(result)
+            result = result[:count]
+            
+            text = f"Fines {offset + 1}-{offset + len(result)} ({len(result)} fine(s))\n\n" + _dumps(result)
+            if truncated:
+                text += f"\n[truncated - continue from offset {offset + len(result)}]"
             return [TextContent(
                 type="text",
-                text=f"Total: {len(result)} fine(s)\n\n" +
-                     json.dumps(result, indent=2, default=str)
+                text=text
             )]
         
         else:
@@ -308,5 +405,11 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
         )]
 
 
+async def main():
+    """Serve tool calls over stdio until the client disconnects."""
+    async with stdio_server() as (read_stream, write_stream):
+        await app.run(read_stream, write_stream, app.create_initialization_options())
+
+
 if __name__ == "__main__":
-    stdio_server(app).run()
+    asyncio.run(main())
@@ -45,11 +45,14 @@ class Config:
         # Google Calendar API configuration
         self.SCOPES = ['https://www.googleapis.com/auth/calendar']
         self.CREDENTIALS_FILE = self.PROJECT_ROOT / 'credentials.json'
-        self.TOKEN_FILE = self.PROJECT_ROOT / 'token.pickle'
+        self.TOKEN_FILE = self.PROJECT_ROOT / 'token.json'
         
         # PDF scanning configuration
         self.DEFAULT_PDF_FOLDER = self.PROJECT_ROOT / 'multas'
         
+        # Parsed PDF data, reused while a file is unchanged
+        self.PDF_CACHE_FILE = self.PROJECT_ROOT / 'pdf_cache.db'
+        
         # Logging configuration
         self.LOG_FILE = self.PROJECT_ROOT / 'app.log'
         
@@ -90,6 +93,9 @@ class Config:
                 if 'default_pdf_folder' in config_data:
                     self.DEFAULT_PDF_FOLDER = Path(config_data['default_pdf_folder'])
                 
+                if 'pdf_cache_file' in config_data:
+                    self.PDF_CACHE_FILE = Path(config_data['pdf_cache_file'])
+                
                 if 'log_file' in config_data:
                     self.LOG_FILE = Path(config_data['log_file'])
                 
@@ -121,6 +127,9 @@ class Config:
         if os.getenv('TRAFFICFINES_PDF_FOLDER'):
             self.DEFAULT_PDF_FOLDER = Path(os.getenv('TRAFFICFINES_PDF_FOLDER'))
         
+        if os.getenv('TRAFFICFINES_PDF_CACHE_FILE'):
+            self.PDF_CACHE_FILE = Path(os.getenv('TRAFFICFINES_PDF_CACHE_FILE'))
+        
         # Logging configuration
         if os.getenv('TRAFFICFINES_LOG_FILE'):
             self.LOG_FILE = Path(os.getenv('TRAFFICFINES_LOG_FILE'))
@@ -153,6 +162,7 @@ class Config:
         self.CREDENTIALS_FILE = str(self.CREDENTIALS_FILE)
         self.TOKEN_FILE = str(self.TOKEN_FILE)
         self.DEFAULT_PDF_FOLDER = str(self.DEFAULT_PDF_FOLDER)
+        self.PDF_CACHE_FILE = str(self.PDF_CACHE_FILE)
         self.LOG_FILE = str(self.LOG_FILE)
     
     def validate(self) -> Tuple[bool, List[str], List[str]]:
@@ -287,6 +297,7 @@ DATABASE_PATH = _config.DATABASE_PATH
 CREDENTIALS_FILE = _config.CREDENTIALS_FILE
 TOKEN_FILE = _config.TOKEN_FILE
 DEFAULT_PDF_FOLDER = _config.DEFAULT_PDF_FOLDER
+PDF_CACHE_FILE = _config.PDF_CACHE_FILE
 LOG_FILE = _config.LOG_FILE
 LOCALE = _config.LOCALE
 SCOPES = _config.SCOPES
@@ -1,11 +1,67 @@
 # db/database.py
+import atexit
+import datetime
 import sqlite3
 import os
+import threading
+import weakref
 from trafficfines.config import DATABASE_PATH
 from trafficfines.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Secondary indexes. The partial ones cover only the fines still waiting for
+# calendar events, so the "pending" queries seek straight to them instead of
+# scanning the table
+INDEX_STATEMENTS = {
+    'idx_fines_pending_payment': '''
+    CREATE INDEX IF NOT EXISTS idx_fines_pending_payment
+    ON fines(defense_due_date)
+    WHERE payment_event_created = 0 AND defense_due_date IS NOT NULL
+    ''',
+    'idx_fines_pending_driverid': '''
+    CREATE INDEX IF NOT EXISTS idx_fines_pending_driverid
+    ON fines(driver_id_due_date)
+    WHERE driver_id_event_created = 0 AND driver_id_due_date IS NOT NULL
+    ''',
+    # Lets the fines list read rows in ORDER BY order without a sort step
+    'idx_fines_violation_date_desc': '''
+    CREATE INDEX IF NOT EXISTS idx_fines_violation_date_desc
+    ON fines(violation_date DESC)
+    ''',
+    # Plate lookups, already in the order they are returned
+    'idx_fines_license_plate': '''
+    CREATE INDEX IF NOT EXISTS idx_fines_license_plate
+    ON fines(license_plate, violation_date DESC)
+    ''',
+}
+
+# Below this many rows, maintaining the indexes per insert is cheaper than
+# dropping and rebuilding them
+BULK_INDEX_THRESHOLD = 1000
+
+
+
+def _convert_date(value):
+    """Convert a stored DATE value back to datetime.date"""
+    text = value.decode()
+    try:
+        return datetime.date.fromisoformat(text)
+    except ValueError:
+        # Leave anything that is not an ISO date as it was stored
+        return text
+
+
+# Store dates as ISO 8601 text, which sorts and compares correctly, and hand
+# DATE columns back to Python as datetime.date
+sqlite3.register_adapter(datetime.date, datetime.date.isoformat)
+sqlite3.register_converter("DATE", _convert_date)
+
+
+_schema_ready = False
+_schema_lock = threading.Lock()
+
+
 class DatabaseManager:
     def __init__(self):
         """Initialize database connection"""
@@ -16,16 +72,43 @@ class DatabaseManager:
     def connect(self):
         """Connect to SQLite database"""
         try:
-            self.conn = sqlite3.connect(DATABASE_PATH)
+            # check_same_thread=False so the connection can still be closed
+            # from the main thread at exit; each thread otherwise uses its own
+            self.conn = sqlite3.connect(
+                DATABASE_PATH,
+                cached_statements=256,
+                check_same_thread=False,
+                detect_types=sqlite3.PARSE_DECLTYPES
+            )
+            self.configure_connection()
             self.conn.row_factory = sqlite3.Row  # Return rows as dictionaries
             self.cursor = self.conn.cursor()
-            self.create_tables()
+            self.ensure_schema()
             logger.info(f"Successfully connected to database: {DATABASE_PATH}")
             return True
         except sqlite3.Error as e:
             logger.error(f"Database connection error: {e}", exc_info=True)
             return False
     
+    def configure_connection(self):
+        """Apply performance PRAGMAs to the open connection"""
+        # WAL avoids the rollback-journal double write and lets readers run
+        # alongside a writer; NORMAL sync is safe in WAL mode and drops one
+        # fsync per commit.
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA temp_store=MEMORY")
+        self.conn.execute("PRAGMA cache_size=-65536")  # 64 MiB
+        self.conn.execute("PRAGMA mmap_size=268435456")  # 256 MiB
+
+    def ensure_schema(self):
+        """Create the schema on the first connection of the process only"""
+        global _schema_ready
+        with _schema_lock:
+            if not _schema_ready:
+                self.create_tables()
+                _schema_ready = True
+    
     def create_tables(self):
         """Create necessary database tables if they don't exist"""
         self.cursor.execute('''
@@ -53,13 +136,104 @@ class DatabaseManager:
             driver_id_event_created BOOLEAN DEFAULT 0
         )
         ''')
+        # Local copy of this app's Calendar events, kept current with
+        # incremental syncs (one sync token per calendar)
+        self.cursor.execute('''
+        CREATE TABLE IF NOT EXISTS calendar_sync (
+            calendar_id TEXT PRIMARY KEY,
+            sync_token TEXT,
+            synced_at TIMESTAMP
+        )
+        ''')
+        self.cursor.execute('''
+        CREATE TABLE IF NOT EXISTS calendar_events (
+            calendar_id TEXT NOT NULL,
+            event_id TEXT NOT NULL,
+            summary TEXT,
+            PRIMARY KEY (calendar_id, event_id)
+        )
+        ''')
+        for statement in INDEX_STATEMENTS.values():
+            self.cursor.execute(statement)
         self.conn.commit()
     
+    def bulk_ingest(self, sql, rows):
+        """
+        Run an executemany write inside a single transaction.
+        
+        For large batches the secondary indexes are dropped first and rebuilt
+        afterwards, so SQLite sorts each index once instead of updating it for
+        every row. The UNIQUE index on fine_number is left alone because
+        the upsert relies on it for conflict resolution. Everything
+        happens in one transaction, so a failure leaves the indexes intact.
+        
+        Args:
+            sql: Parameterised INSERT/UPDATE statement
+            rows: List of parameter tuples
+        """
+        rebuild_indexes = len(rows) >= BULK_INDEX_THRESHOLD
+        try:
+            self.conn.execute("BEGIN")
+            if rebuild_indexes:
+                for name in INDEX_STATEMENTS:
+                    self.conn.execute(f"DROP INDEX IF EXISTS {name}")
+            self.cursor.executemany(sql, rows)
+            if rebuild_indexes:
+                for statement in INDEX_STATEMENTS.values():
+                    self.conn.execute(statement)
+            self.conn.commit()
+        except Exception:
+            if self.conn.in_transaction:
+                self.conn.rollback()
+            raise
+        # Let SQLite refresh planner statistics that the batch made stale
+        self.conn.execute("PRAGMA optimize")
+    
     def close(self):
         """Close database connection"""
         if self.conn:
+            try:
+                # Update the statistics the queries on this connection rely on
+                self.conn.execute("PRAGMA optimize")
+            except sqlite3.Error as e:
+                logger.warning(f"PRAGMA optimize failed on close: {e}")
             self.conn.close()
+            self.conn = None
+            self.cursor = None
     
-    def __del__(self):
-        """Destructor to ensure database connection is closed"""
-        self.close()
\ No newline at end of file
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+
+# One connection per thread: sqlite3 connections must not be used from two
+# threads at once, and with WAL readers on other threads do not block the
+# writer. The WeakSet lets a finished thread's connection be reclaimed.
+_local = threading.local()
+_instances = weakref.WeakSet()
+_instances_lock = threading.Lock()
+
+
+def get_db() -> DatabaseManager:
+    """Get the calling thread's database manager, connecting on first use."""
+    db = getattr(_local, 'db', None)
+    if db is None:
+        db = DatabaseManager()
+        _local.db = db
+        with _instances_lock:
+            _instances.add(db)
+    return db
+
+
+def close_all() -> None:
+    """Close every thread's database connection."""
+    with _instances_lock:
+        for db in list(_instances):
+            db.close()
+
+
+# Close once at interpreter shutdown rather than from a finalizer
+atexit.register(close_all)
@@ -1,48 +1,195 @@
 # db/models.py
-from trafficfines.db.database import DatabaseManager
+import datetime
+from trafficfines.config import LOCALE
+from trafficfines.db.database import get_db
 from trafficfines.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# SQL text is kept at module level so each call reuses the same string and
+# hits the connection's prepared-statement cache
+#
+# Upsert updates an existing fine in place, keeping its id and the
+# *_event_created flags, so rescanning a PDF does not queue its calendar
+# events again. The WHERE clause skips the write entirely when nothing in
+# the row changed.
+_INSERT_SQL = '''
+INSERT INTO fines 
+(fine_number, notification_date, defense_due_date, driver_id_due_date,
+ license_plate, vehicle_model, violation_location, violation_date,
+ violation_time, violation_code, amount, description, measured_speed,
+ considered_speed, speed_limit, owner_name, owner_document, pdf_path)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(fine_number) DO UPDATE SET
+    notification_date = excluded.notification_date,
+    defense_due_date = excluded.defense_due_date,
+    driver_id_due_date = excluded.driver_id_due_date,
+    license_plate = excluded.license_plate,
+    vehicle_model = excluded.vehicle_model,
+    violation_location = excluded.violation_location,
+    violation_date = excluded.violation_date,
+    violation_time = excluded.violation_time,
+    violation_code = excluded.violation_code,
+    amount = excluded.amount,
+    description = excluded.description,
+    measured_speed = excluded.measured_speed,
+    considered_speed = excluded.considered_speed,
+    speed_limit = excluded.speed_limit,
+    owner_name = excluded.owner_name,
+    owner_document = excluded.owner_document,
+    pdf_path = excluded.pdf_path
+WHERE (fines.notification_date, fines.defense_due_date, fines.driver_id_due_date,
+       fines.license_plate, fines.vehicle_model, fines.violation_location,
+       fines.violation_date, fines.violation_time, fines.violation_code,
+       fines.amount, fines.description, fines.measured_speed,
+       fines.considered_speed, fines.speed_limit, fines.owner_name,
+       fines.owner_document, fines.pdf_path)
+   IS NOT (excluded.notification_date, excluded.defense_due_date, excluded.driver_id_due_date,
+           excluded.license_plate, excluded.vehicle_model, excluded.violation_location,
+           excluded.violation_date, excluded.violation_time, excluded.violation_code,
+           excluded.amount, excluded.description, excluded.measured_speed,
+           excluded.considered_speed, excluded.speed_limit, excluded.owner_name,
+           excluded.owner_document, excluded.pdf_path)
+'''
+
+# Only the columns the fines list and the MCP server read
+_SELECT_LIST_SQL = '''
+SELECT fine_number, notification_date, driver_id_due_date, license_plate,
+       violation_date, amount, description,
+       payment_event_created, driver_id_event_created
+FROM fines
+'''
+# id breaks ties so LIMIT/OFFSET pages neither repeat nor skip rows; the
+# violation_date indexes already hold rows in this order
+_ORDER_BY_VIOLATION_SQL = " ORDER BY violation_date DESC, id"
+_SELECT_ALL_SQL = _SELECT_LIST_SQL + _ORDER_BY_VIOLATION_SQL
+_SELECT_PAGE_SQL = _SELECT_ALL_SQL + " LIMIT ? OFFSET ?"
+_COUNT_SQL = "SELECT COUNT(*) FROM fines"
+
+# query_fines status filters
+_STATUS_CONDITIONS = {
+    'pending_payment': "payment_event_created = 0",
+    'pending_driver_id': "driver_id_event_created = 0",
+    'complete': "payment_event_created = 1 AND driver_id_event_created = 1",
+}
+# Matches the search text against the columns the fines list shows, with
+# dates rendered in the configured display format. The columns are joined
+# into one unit-separator-delimited haystack so each row needs a single LIKE.
+_SEARCH_CONDITION = r'''(
+    ifnull(fine_number, '') || char(31) ||
+    ifnull(license_plate, '') || char(31) ||
+    ifnull(strftime(:date_format, notification_date), '') || char(31) ||
+    ifnull(strftime(:date_format, driver_id_due_date), '')
+) LIKE :pattern ESCAPE '\'
+'''
+
+_SELECT_BY_PLATE_SQL = _SELECT_LIST_SQL + " WHERE license_plate = ?" + _ORDER_BY_VIOLATION_SQL
+
+_SELECT_PENDING_PAYMENT_SQL = '''
+SELECT id, fine_number, license_plate, defense_due_date, amount
+FROM fines 
+WHERE payment_event_created = 0 AND defense_due_date IS NOT NULL
+'''
+
+_SELECT_PENDING_DRIVER_ID_SQL = '''
+SELECT id, fine_number, license_plate, driver_id_due_date
+FROM fines 
+WHERE driver_id_event_created = 0 AND driver_id_due_date IS NOT NULL
+'''
+
+_MARK_PAYMENT_SQL = "UPDATE fines SET payment_event_created = 1 WHERE id = ?"
+_MARK_DRIVER_ID_SQL = "UPDATE fines SET driver_id_event_created = 1 WHERE id = ?"
+
+_SELECT_SYNC_TOKEN_SQL = "SELECT sync_token FROM calendar_sync WHERE calendar_id = ?"
+# synced_at is stored as CURRENT_TIMESTAMP (UTC), so compare in SQLite's clock
+_SELECT_SYNC_FRESH_SQL = """
+SELECT 1 FROM calendar_sync
+WHERE calendar_id = ? AND synced_at >= datetime('now', ?)
+"""
+_EXPIRE_SYNC_SQL = "UPDATE calendar_sync SET synced_at = NULL"
+_SELECT_EVENT_SUMMARIES_SQL = "SELECT summary FROM calendar_events WHERE calendar_id = ?"
+_CLEAR_EVENTS_SQL = "DELETE FROM calendar_events WHERE calendar_id = ?"
+_UPSERT_EVENT_SQL = '''
+INSERT INTO calendar_events (calendar_id, event_id, summary) VALUES (?, ?, ?)
+ON CONFLICT(calendar_id, event_id) DO UPDATE SET summary = excluded.summary
+'''
+_DELETE_EVENT_SQL = "DELETE FROM calendar_events WHERE calendar_id = ? AND event_id = ?"
+_SAVE_SYNC_TOKEN_SQL = '''
+INSERT INTO calendar_sync (calendar_id, sync_token, synced_at) VALUES (?, ?, CURRENT_TIMESTAMP)
+ON CONFLICT(calendar_id) DO UPDATE SET sync_token = excluded.sync_token, synced_at = excluded.synced_at
+'''
+
+# Everything the details view shows (all columns but id)
+_SELECT_BY_NUMBER_SQL = '''
+SELECT fine_number, notification_date, defense_due_date, driver_id_due_date,
+       license_plate, vehicle_model, violation_location, violation_date,
+       violation_time, violation_code, amount, description, measured_speed,
+       considered_speed, speed_limit, owner_name, owner_document, pdf_path,
+       payment_event_created, driver_id_event_created
+FROM fines WHERE fine_number = ?
+'''
+
+_SELECT_SUMMARY_BY_NUMBER_SQL = '''
+SELECT fine_number, license_plate, violation_date, amount, description, violation_location
+FROM fines WHERE fine_number = ?
+'''
+
+# Ids per UPDATE ... IN (...) statement, below SQLite's 999-variable limit
+_IN_CLAUSE_CHUNK = 500
+
+
+def _check_date(fine_data, field):
+    """
+    Return a date field as datetime.date, so it is stored as ISO 8601.
+    
+    Raises:
+        ValueError: If the value is neither a date, an ISO date string nor None
+    """
+    value = fine_data[field]
+    if value is None or isinstance(value, datetime.date):
+        return value
+    if isinstance(value, str):
+        return datetime.date.fromisoformat(value)
+    raise ValueError(f"{field} must be a date, got {type(value).__name__}")
+
 class FineModel:
-    def __init__(self):
-        self.db = DatabaseManager()
+    @property
+    def db(self):
+        """Database manager for the calling thread"""
+        return get_db()
+    
+    def _to_row(self, fine_data):
+        """Build the INSERT parameter tuple for a fine"""
+        return (
+            fine_data['fine_number'],
+            _check_date(fine_data, 'notification_date'),
+            _check_date(fine_data, 'defense_due_date'),
+            _check_date(fine_data, 'driver_id_due_date'),
+            fine_data['license_plate'],
+            fine_data['vehicle_model'],
+            fine_data['violation_location'],
+            _check_date(fine_data, 'violation_date'),
+            fine_data['violation_time'],
+            fine_data['violation_code'],
+            fine_data['amount'],
+            fine_data['description'],
+            fine_data['measured_speed'],
+            fine_data['considered_speed'],
+            fine_data['speed_limit'],
+            fine_data['owner_name'],
+            fine_data['owner_document'],
+            fine_data['pdf_path']
+        )
     
     def save_fine(self, fine_data):
         """Save or update fine data in database"""
         try:
             fine_number = fine_data.get('fine_number', 'Unknown')
-            logger.debug(f"Attempting to save fine: {fine_number}")
+            logger.debug("Attempting to save fine: %s", fine_number)
             
-            self.db.cursor.execute('''
-            INSERT OR REPLACE INTO fines 
-            (fine_number, notification_date, defense_due_date, driver_id_due_date,
-             license_plate, vehicle_model, violation_location, violation_date,
-             violation_time, violation_code, amount, description, measured_speed,
-             considered_speed, speed_limit, owner_name, owner_document, pdf_path)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                fine_data['fine_number'],
-                fine_data['notification_date'],
-                fine_data['defense_due_date'],
-                fine_data['driver_id_due_date'],
-                fine_data['license_plate'],
-                fine_data['vehicle_model'],
-                fine_data['violation_location'],
-                fine_data['violation_date'],
-                fine_data['violation_time'],
-                fine_data['violation_code'],
-                fine_data['amount'],
-                fine_data['description'],
-                fine_data['measured_speed'],
-                fine_data['considered_speed'],
-                fine_data['speed_limit'],
-                fine_data['owner_name'],
-                fine_data['owner_document'],
-                fine_data['pdf_path']
-            ))
+            self.db.cursor.execute(_INSERT_SQL, self._to_row(fine_data))
             self.db.conn.commit()
-            logger.info(f"Successfully saved fine to database: {fine_number}")
+            logger.info("Successfully saved fine to database: %s", fine_number)
             return True
         except Exception as e:
             fine_number = fine_data.get('fine_number', 'Unknown')
@@ -52,53 +199,239 @@ class FineModel:
             )
             return False
     
+    def save_fines_bulk(self, fines):
+        """
+        Save or update several fines in a single transaction.
+        
+        One BEGIN/COMMIT pair wraps the whole batch, so SQLite syncs to disk
+        once instead of once per fine.
+        
+        Args:
+            fines: List of fine data dictionaries
+        
+        Returns:
+            True if every fine was saved, False if the batch was rolled back
+        """
+        if not fines:
+            return True
+        
+        try:
+            logger.debug("Attempting to save %s fines in bulk", len(fines))
+            rows = [self._to_row(fine_data) for fine_data in fines]
+            self.db.bulk_ingest(_INSERT_SQL, rows)
+            logger.info("Successfully saved %s fines to database", len(rows))
+            return True
+        except Exception as e:
+            logger.error("Error saving %s fines to database: %s", len(fines), e, exc_info=True)
+            return False
+    
     def get_all_fines(self):
-        """Retrieve all fines from database"""
-        self.db.cursor.execute('''
-        SELECT fine_number, notification_date, defense_due_date, driver_id_due_date,
-               license_plate, vehicle_model, violation_location, violation_date,
-               violation_time, violation_code, amount, description, measured_speed,
-               considered_speed, speed_limit, owner_name, owner_document, pdf_path,
-               payment_event_created, driver_id_event_created
-        FROM fines ORDER BY violation_date DESC
-        ''')
-        return self.db.cursor.fetchall()
+        """
+        Retrieve all fines from database, newest violation first.
+        
+        Rows are yielded straight from a dedicated cursor instead of being
+        materialised up front; wrap the call in list() if a list is needed.
+        """
+        yield from self.db.conn.execute(_SELECT_ALL_SQL)
+    
+    def count_fines(self):
+        """Return the number of fines in the database"""
+        return self.db.conn.execute(_COUNT_SQL).fetchone()[0]
+    
+    def get_fines_page(self, limit, offset=0):
+        """
+        Retrieve one page of fines in get_all_fines order.
+        
+        Args:
+            limit: Maximum number of fines to return
+            offset: Number of fines to skip first
+        
+        Returns:
+            List of rows
+        """
+        return self.db.conn.execute(_SELECT_PAGE_SQL, (limit, offset)).fetchall()
+    
+    def query_fines(self, status=None, search=None, limit=None, offset=0):
+        """
+        Retrieve fines matching a status filter and search text, newest
+        violation first, filtering in SQL rather than in Python.
+        
+        Each call reads its rows and finishes the statement, so paging
+        through a result holds no read transaction open between pages.
+        
+        Args:
+            status: None for all fines, or 'pending_payment',
+                'pending_driver_id' or 'complete'
+            search: Optional text matched case-insensitively (ASCII) against
+                fine number, license plate and the formatted notification
+                and driver ID due dates
+            limit: Maximum number of fines to return, or None for all
+            offset: Number of matching fines to skip first
+        
+        Returns:
+            List of rows with the same columns as get_all_fines
+        """
+        conditions = []
+        params = {'limit': -1 if limit is None else limit, 'offset': offset}
+        if status:
+            conditions.append(_STATUS_CONDITIONS[status])
+        if search:
+            escaped = search.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            conditions.append(_SEARCH_CONDITION)
+            params['pattern'] = f"%{escaped}%"
+            params['date_format'] = LOCALE['date_format']
+        
+        sql = _SELECT_LIST_SQL
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += _ORDER_BY_VIOLATION_SQL + " LIMIT :limit OFFSET :offset"
+        return self.db.conn.execute(sql, params).fetchall()
+    
+    def get_fines_by_plate(self, license_plate):
+        """
+        Retrieve the fines for a license plate, newest violation first.
+        
+        Returns:
+            List of rows with the same columns as get_all_fines
+        """
+        return self.db.conn.execute(_SELECT_BY_PLATE_SQL, (license_plate,)).fetchall()
     
     def get_fines_without_payment_events(self):
         """Retrieve fines without payment events"""
-        self.db.cursor.execute('''
-        SELECT id, fine_number, defense_due_date, amount
-        FROM fines 
-        WHERE payment_event_created = 0 AND defense_due_date IS NOT NULL
-        ''')
+        self.db.cursor.execute(_SELECT_PENDING_PAYMENT_SQL)
         return self.db.cursor.fetchall()
     
     def get_fines_without_driver_id_events(self):
         """Retrieve fines without driver ID events"""
-        self.db.cursor.execute('''
-        SELECT id, fine_number, driver_id_due_date
-        FROM fines 
-        WHERE driver_id_event_created = 0 AND driver_id_due_date IS NOT NULL
-        ''')
+        self.db.cursor.execute(_SELECT_PENDING_DRIVER_ID_SQL)
         return self.db.cursor.fetchall()
     
     def mark_payment_event_created(self, fine_id):
         """Mark payment event as created for a fine"""
-        self.db.cursor.execute('''
-        UPDATE fines SET payment_event_created = 1 WHERE id = ?
-        ''', (fine_id,))
+        self.db.cursor.execute(_MARK_PAYMENT_SQL, (fine_id,))
         self.db.conn.commit()
     
     def mark_driver_id_event_created(self, fine_id):
         """Mark driver ID event as created for a fine"""
-        self.db.cursor.execute('''
-        UPDATE fines SET driver_id_event_created = 1 WHERE id = ?
-        ''', (fine_id,))
+        self.db.cursor.execute(_MARK_DRIVER_ID_SQL, (fine_id,))
         self.db.conn.commit()
     
+    def mark_payment_events_created(self, fine_ids):
+        """
+        Mark payment events as created for several fines in one transaction.
+        
+        Args:
+            fine_ids: Iterable of fine IDs
+        """
+        self.bulk_mark_events(fine_ids, ())
+    
+    def mark_driver_id_events_created(self, fine_ids):
+        """
+        Mark driver ID events as created for several fines in one transaction.
+        
+        Args:
+            fine_ids: Iterable of fine IDs
+        """
+        self.bulk_mark_events((), fine_ids)
+    
+    def bulk_mark_events(self, payment_ids, driver_id_ids):
+        """
+        Mark payment and driver ID events as created in a single transaction.
+        
+        Each flag is set with one UPDATE ... WHERE id IN (...) per chunk of
+        IDs rather than one statement per fine.
+        
+        Args:
+            payment_ids: Iterable of fine IDs whose payment event exists
+            driver_id_ids: Iterable of fine IDs whose driver ID event exists
+        """
+        payment_ids = list(payment_ids)
+        driver_id_ids = list(driver_id_ids)
+        if not payment_ids and not driver_id_ids:
+            return
+        
+        try:
+            self.db.conn.execute("BEGIN")
+            self._set_event_flag('payment_event_created', payment_ids)
+            self._set_event_flag('driver_id_event_created', driver_id_ids)
+            self.db.conn.commit()
+            logger.debug(
+                f"Marked events created: {len(payment_ids)} payment, {len(driver_id_ids)} driver ID"
+            )
+        except Exception:
+            if self.db.conn.in_transaction:
+                self.db.conn.rollback()
+            raise
+    
+    def _set_event_flag(self, column, fine_ids):
+        """Set an event flag for the given fines, chunked to stay under SQLite's parameter limit"""
+        for start in range(0, len(fine_ids), _IN_CLAUSE_CHUNK):
+            chunk = fine_ids[start:start + _IN_CLAUSE_CHUNK]
+            placeholders = ', '.join('?' * len(chunk))
+            self.db.conn.execute(f"UPDATE fines SET {column} = 1 WHERE id IN ({placeholders})", chunk)
+    
     def get_fine_by_number(self, fine_number):
-        """Retrieve a fine by its number"""
-        self.db.cursor.execute('''
-        SELECT * FROM fines WHERE fine_number = ?
-        ''', (fine_number,))
-        return self.db.cursor.fetchone()
\ No newline at end of file
+        """Retrieve a fine by its number, with every column except id"""
+        self.db.cursor.execute(_SELECT_BY_NUMBER_SQL, (fine_number,))
+        return self.db.cursor.fetchone()
+    
+    def get_fine_summary_by_number(self, fine_number):
+        """Retrieve the key fields of a fine (number, plate, date, amount, description, location)"""
+        self.db.cursor.execute(_SELECT_SUMMARY_BY_NUMBER_SQL, (fine_number,))
+        return self.db.cursor.fetchone()
+    
+    def get_calendar_sync_token(self, calendar_id='primary'):
+        """Return the stored Calendar sync token, or None before the first sync"""
+        row = self.db.conn.execute(_SELECT_SYNC_TOKEN_SQL, (calendar_id,)).fetchone()
+        return row['sync_token'] if row else None
+    
+    def is_calendar_index_fresh(self, calendar_id='primary', max_age=0):
+        """Return True if the local event index was synced within max_age seconds"""
+        row = self.db.conn.execute(
+            _SELECT_SYNC_FRESH_SQL, (calendar_id, f'-{int(max_age)} seconds')
+        ).fetchone()
+        return row is not None
+    
+    def expire_calendar_index(self):
+        """Make the next sync of every calendar ask the API again"""
+        self.db.conn.execute(_EXPIRE_SYNC_SQL)
+        self.db.conn.commit()
+    
+    def get_calendar_event_summaries(self, calendar_id='primary'):
+        """Return the summaries of all locally indexed Calendar events"""
+        return {
+            row['summary']
+            for row in self.db.conn.execute(_SELECT_EVENT_SUMMARIES_SQL, (calendar_id,))
+        }
+    
+    def apply_calendar_sync(self, calendar_id, upserts, deletions, sync_token, full=False):
+        """
+        Apply one Calendar sync result to the local event index in a single transaction.
+        
+        Args:
+            calendar_id: Calendar the changes belong to
+            upserts: List of (event_id, summary) tuples for new or changed events
+            deletions: List of event IDs that were cancelled or no longer match
+            sync_token: nextSyncToken to use for the following sync
+            full: If True, the result is a full listing and replaces the index
+        """
+        try:
+            self.db.conn.execute("BEGIN")
+            if full:
+                self.db.conn.execute(_CLEAR_EVENTS_SQL, (calendar_id,))
+            self.db.cursor.executemany(
+                _DELETE_EVENT_SQL, [(calendar_id, event_id) for event_id in deletions]
+            )
+            self.db.cursor.executemany(
+                _UPSERT_EVENT_SQL, [(calendar_id, event_id, summary) for event_id, summary in upserts]
+            )
+            self.db.conn.execute(_SAVE_SYNC_TOKEN_SQL, (calendar_id, sync_token))
+            self.db.conn.commit()
+            logger.debug(
+                "Applied calendar sync for %s: %s upserts, %s deletions",
+                calendar_id, len(upserts), len(deletions)
+            )
+        except Exception:
+            if self.db.conn.in_transaction:
+                self.db.conn.rollback()
+            raise
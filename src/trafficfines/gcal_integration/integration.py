@@ -1,12 +1,10 @@
 # gcal_integration/integration.py
 import os
-import datetime
-import pickle
-from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.auth.transport.requests import Request
-from googleapiclient.errors import HttpError
+import functools
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from trafficfines.config import SCOPES, CREDENTIALS_FILE, TOKEN_FILE, LOCALE
 from trafficfines.utils.helpers import format_currency
 from trafficfines.db.models import FineModel
@@ -15,17 +13,118 @@ from trafficfines.utils.error_messages import ErrorMessageMapper
 
 logger = get_logger(__name__)
 
+PAYMENT_EVENT_PREFIX = 'Traffic Fine Payment Due: '
+DRIVER_ID_EVENT_PREFIX = 'Driver ID Submission Due: '
+EVENT_PREFIXES = (PAYMENT_EVENT_PREFIX, DRIVER_ID_EVENT_PREFIX)
+
+# Partial responses: only the attributes this module reads are requested
+EVENT_LIST_FIELDS = 'items(id,status,summary),nextPageToken,nextSyncToken'
+
+# Shared by every event body; the client serialises bodies to JSON, so the
+# same dict can be referenced from all of them
+_DEFAULT_REMINDERS = {
+    'useDefault': False,
+    'overrides': [
+        {'method': 'email', 'minutes': 24 * 60},
+        {'method': 'popup', 'minutes': 24 * 60},
+    ],
+}
+
+# How long the primary calendar's owner address is reused before asking again
+USER_EMAIL_TTL = 300
+
+# How long a synced event index is trusted before events.list is asked again
+EVENT_INDEX_TTL = 900
+
+# Google's batch endpoint accepts at most 50 sub-requests per call
+BATCH_SIZE = 50
+# Batches sent concurrently; kept low to stay within per-user rate limits
+BATCH_WORKERS = 4
+
+
+_discovery_document = None
+_discovery_lock = threading.Lock()
+
+
+def _build_calendar_service(credentials):
+    """
+    Build a Calendar v3 service from the discovery document bundled with
+    the client library.
+    
+    The document is read and parsed once per process, so setup and the
+    per-thread services used for concurrent batches skip both the HTTPS
+    discovery fetch and repeated JSON parsing.
+    """
+    global _discovery_document
+    from googleapiclient.discovery import build_from_document
+    
+    if _discovery_document is None:
+        with _discovery_lock:
+            if _discovery_document is None:
+                from googleapiclient.discovery_cache import get_static_doc
+                _discovery_document = json.loads(get_static_doc('calendar', 'v3'))
+    return build_from_document(_discovery_document, credentials=credentials)
+
+
 class CalendarIntegration:
     def __init__(self):
-        self.calendar_service = None
+        """
+        Create the integration without touching the network.
+        
+        Credentials are loaded and the service is built on first use of
+        calendar_service, or ahead of time by calling initialize() from a
+        background thread.
+        """
+        self._calendar_service = None
+        self._initialized = False
+        self._init_lock = threading.Lock()
+        self.credentials = None
+        # Service objects for worker threads; httplib2 connections must not
+        # be shared between threads
+        self._thread_local = threading.local()
+        # (email, monotonic timestamp) from the last calendars.get call
+        self._user_email_cache = None
+        # {calendar_id: (summaries, monotonic timestamp)} from the last sync;
+        # events this instance creates are added to the set as they succeed
+        self._event_index_cache = {}
         self.fine_model = FineModel()
-        # Try to set up calendar service, but don't fail if it doesn't work
-        try:
-            self.calendar_service = self.setup_google_calendar()
-        except Exception as e:
-            logger.warning(f"Could not initialize Google Calendar service: {e}")
-            logger.info("Calendar features will be disabled. You can re-authenticate later.")
-            # Don't raise - allow app to start without calendar
+    
+    @property
+    def calendar_service(self):
+        """Google Calendar service, set up on first access (None if unavailable)"""
+        if not self._initialized:
+            self.initialize()
+        return self._calendar_service
+    
+    @calendar_service.setter
+    def calendar_service(self, service):
+        self._calendar_service = service
+        self._initialized = True
+    
+    def initialize(self):
+        """
+        Set up the calendar service once; safe to call from any thread.
+        
+        Failures are logged rather than raised so the app keeps working
+        without calendar features.
+        
+        Returns:
+            True if the calendar service is available
+        """
+        with self._init_lock:
+            if not self._initialized:
+                try:
+                    self._calendar_service = self.setup_google_calendar()
+                except Exception as e:
+                    logger.warning(f"Could not initialize Google Calendar service: {e}")
+                    logger.info("Calendar features will be disabled. You can re-authenticate later.")
+                    # Don't raise - allow app to start without calendar
+                self._initialized = True
+        return self._calendar_service is not None
+    
+    def is_initialized(self):
+        """Return True once setup has been attempted"""
+        return self._initialized
     
     def setup_google_calendar(self, force_reauth: bool = False):
         """
@@ -37,6 +136,11 @@ class CalendarIntegration:
         Returns:
             Google Calendar API service object
         """
+        # The Google client libraries are slow to import, so only load them
+        # once calendar access is actually being set up
+        from google_auth_oauthlib.flow import InstalledAppFlow
+        from google.auth.transport.requests import Request
+        
         try:
             creds = None
             
@@ -45,10 +149,8 @@ class CalendarIntegration:
                 logger.info("Forcing re-authentication - removing existing token")
                 os.remove(TOKEN_FILE)
             
-            if os.path.exists(TOKEN_FILE) and not force_reauth:
-                logger.debug(f"Loading existing token from {TOKEN_FILE}")
-                with open(TOKEN_FILE, 'rb') as token:
-                    creds = pickle.load(token)
+            if not force_reauth:
+                creds = self._load_credentials()
                     
             if not creds or not creds.valid:
                 if creds and creds.expired and creds.refresh_token and not force_reauth:
@@ -68,11 +170,12 @@ class CalendarIntegration:
                     creds = flow.run_local_server(port=0)
                 
                 logger.info("Saving credentials to token file")
-                with open(TOKEN_FILE, 'wb') as token:
-                    pickle.dump(creds, token)
+                with open(TOKEN_FILE, 'w', encoding='utf-8') as token:
+                    token.write(creds.to_json())
                     
+            self.credentials = creds
             logger.info("Successfully set up Google Calendar API")
-            return build('calendar', 'v3', credentials=creds)
+            return _build_calendar_service(creds)
         except FileNotFoundError as e:
             logger.error(ErrorMessageMapper.get_log_message(e, {'file': CREDENTIALS_FILE or TOKEN_FILE}), exc_info=True)
             raise
@@ -80,6 +183,44 @@ class CalendarIntegration:
             logger.error(ErrorMessageMapper.get_log_message(e, {'operation': 'setup_google_calendar'}), exc_info=True)
             raise
     
+    def _load_credentials(self):
+        """
+        Load stored credentials from the JSON token file.
+        
+        A token left behind by older versions (pickled, either at TOKEN_FILE
+        or at token.pickle next to it) is converted to JSON once.
+        
+        Returns:
+            Credentials object, or None if no token is stored
+        """
+        from google.oauth2.credentials import Credentials
+        
+        if os.path.exists(TOKEN_FILE):
+            logger.debug(f"Loading existing token from {TOKEN_FILE}")
+            try:
+                return Credentials.from_authorized_user_file(TOKEN_FILE, SCOPES)
+            except (ValueError, UnicodeDecodeError):
+                legacy_file = TOKEN_FILE
+        else:
+            legacy_file = os.path.join(os.path.dirname(TOKEN_FILE), 'token.pickle')
+            if not os.path.exists(legacy_file):
+                return None
+        
+        logger.info(f"Migrating legacy pickled token {legacy_file} to JSON")
+        import pickle  # only needed for this one-time migration
+        try:
+            with open(legacy_file, 'rb') as token:
+                creds = pickle.load(token)
+        except Exception as e:
+            logger.warning(f"Could not read legacy token {legacy_file}: {e}")
+            return None
+        
+        with open(TOKEN_FILE, 'w', encoding='utf-8') as token:
+            token.write(creds.to_json())
+        if legacy_file != TOKEN_FILE:
+            os.remove(legacy_file)
+        return creds
+    
     def reauthenticate(self):
         """
         Force re-authentication with Google Calendar.
@@ -90,6 +231,9 @@ class CalendarIntegration:
         """
         try:
             logger.info("Starting re-authentication process")
+            self._user_email_cache = None
+            self._event_index_cache.clear()
+            self.fine_model.expire_calendar_index()
             self.calendar_service = self.setup_google_calendar(force_reauth=True)
             logger.info("Re-authentication successful")
             return True
@@ -101,66 +245,69 @@ class CalendarIntegration:
         """
         Check if calendar service is authenticated and available.
         
+        Does not trigger setup, so it is safe to call from the Tk thread;
+        it returns False until initialization has finished.
+        
         Returns:
             True if authenticated, False otherwise
         """
-        return self.calendar_service is not None
+        return self._calendar_service is not None
+    
+    def _build_payment_event(self, fine_number, due_date, amount):
+        """Build the Calendar event body for a payment reminder"""
+        when = {'date': due_date.isoformat(), 'timeZone': LOCALE['timezone']}
+        return {
+            'iCalUID': f'payment-{fine_number}@trafficfines',
+            'summary': f'{PAYMENT_EVENT_PREFIX}{fine_number}',
+            'description': f'Pay traffic fine #{fine_number} - Amount: {format_currency(amount)}',
+            'start': when,
+            'end': when,
+            'reminders': _DEFAULT_REMINDERS,
+        }
+    
+    def _build_driver_id_event(self, fine_number, driver_id_due_date):
+        """Build the Calendar event body for a driver ID submission reminder"""
+        when = {'date': driver_id_due_date.isoformat(), 'timeZone': LOCALE['timezone']}
+        return {
+            'iCalUID': f'driver-id-{fine_number}@trafficfines',
+            'summary': f'{DRIVER_ID_EVENT_PREFIX}{fine_number}',
+            'description': f'Submit driver identification for fine #{fine_number}',
+            'start': when,
+            'end': when,
+            'reminders': _DEFAULT_REMINDERS,
+        }
     
-    def create_payment_event(self, fine_id, fine_number, due_date, amount):
-        """Create Google Calendar event for payment reminder"""
+    def create_payment_event(self, fine_id, fine_number, due_date, amount, existing=None):
+        """
+        Create Google Calendar event for payment reminder.
+        
+        Args:
+            existing: Optional set of event summaries already in the calendar;
+                fines found in it are skipped without any request. Without it
+                the event is imported, which the iCalUID makes idempotent.
+        """
         if self.calendar_service is None:
             logger.warning("Calendar service not available. Please re-authenticate.")
             return False
         
         try:
-            logger.debug(f"Creating payment event for fine {fine_number} (ID: {fine_id})")
-            event = {
-                'summary': f'Traffic Fine Payment Due: {fine_number}',
-                'description': f'Pay traffic fine #{fine_number} - Amount: {format_currency(amount)}',
-                'start': {
-                    'date': due_date.isoformat(),
-                    'timeZone': LOCALE['timezone'],
-                },
-                'end': {
-                    'date': due_date.isoformat(),
-                    'timeZone': LOCALE['timezone'],
-                },
-                'reminders': {
-                    'useDefault': False,
-                    'overrides': [
-                        {'method': 'email', 'minutes': 24 * 60},
-                        {'method': 'popup', 'minutes': 24 * 60},
-                    ],
-                },
-            }
+            logger.debug("Creating payment event for fine %s (ID: %s)", fine_number, fine_id)
+            event = self._build_payment_event(fine_number, due_date, amount)
             
-            # Check for duplicates
-            events_result = self.calendar_service.events().list(
-                calendarId='primary',
-                timeMin=datetime.datetime.combine(due_date, datetime.time.min).isoformat() + 'Z',
-                timeMax=datetime.datetime.combine(due_date, datetime.time.max).isoformat() + 'Z',
-                q=fine_number
-            ).execute()
-            
-            if not events_result.get('items', []):
-                created_event = self.calendar_service.events().insert(
-                    calendarId='primary', body=event).execute()
+            if existing is None or event['summary'] not in existing:
+                # import_ is keyed on the event's iCalUID, so a repeat call
+                # updates the same event instead of creating a duplicate
+                created_event = self.calendar_service.events().import_(
+                    calendarId='primary', body=event, fields='id').execute()
                 
-                logger.info(f"Created payment calendar event for fine {fine_number} (event ID: {created_event.get('id')})")
+                logger.info("Created payment calendar event for fine %s (event ID: %s)", fine_number, created_event.get('id'))
                 
                 # Update the database
                 self.fine_model.mark_payment_event_created(fine_id)
                 return True
             else:
-                logger.debug(f"Payment event for fine {fine_number} already exists, skipping")
+                logger.debug("Payment event for fine %s already exists, skipping", fine_number)
                 return False
-        except HttpError as e:
-            logger.error(ErrorMessageMapper.get_log_message(e, {
-                'operation': 'create_payment_event',
-                'fine_number': fine_number,
-                'fine_id': fine_id
-            }), exc_info=True)
-            return False
         except Exception as e:
             logger.error(ErrorMessageMapper.get_log_message(e, {
                 'operation': 'create_payment_event',
@@ -169,75 +316,215 @@ class CalendarIntegration:
             }), exc_info=True)
             return False
     
-    def create_driver_id_event(self, fine_id, fine_number, driver_id_due_date):
-        """Create Google Calendar event for driver ID submission reminder"""
+    def create_driver_id_event(self, fine_id, fine_number, driver_id_due_date, existing=None):
+        """
+        Create Google Calendar event for driver ID submission reminder.
+        
+        Args:
+            existing: Optional set of event summaries already in the calendar;
+                fines found in it are skipped without any request. Without it
+                the event is imported, which the iCalUID makes idempotent.
+        """
         if self.calendar_service is None:
             logger.warning("Calendar service not available. Please re-authenticate.")
             return False
         
         if not driver_id_due_date:
-            logger.debug(f"No driver ID due date for fine {fine_number}, skipping event creation")
+            logger.debug("No driver ID due date for fine %s, skipping event creation", fine_number)
             return False
         
         try:
-            logger.debug(f"Creating driver ID event for fine {fine_number} (ID: {fine_id})")
-            event = {
-                'summary': f'Driver ID Submission Due: {fine_number}',
-                'description': f'Submit driver identification for fine #{fine_number}',
-                'start': {
-                    'date': driver_id_due_date.isoformat(),
-                    'timeZone': LOCALE['timezone'],
-                },
-                'end': {
-                    'date': driver_id_due_date.isoformat(),
-                    'timeZone': LOCALE['timezone'],
-                },
-                'reminders': {
-                    'useDefault': False,
-                    'overrides': [
-                        {'method': 'email', 'minutes': 24 * 60},
-                        {'method': 'popup', 'minutes': 24 * 60},
-                    ],
-                },
-            }
-            
-            # Check for duplicates
-            events_result = self.calendar_service.events().list(
-                calendarId='primary',
-                timeMin=datetime.datetime.combine(driver_id_due_date, datetime.time.min).isoformat() + 'Z',
-                timeMax=datetime.datetime.combine(driver_id_due_date, datetime.time.max).isoformat() + 'Z',
-                q=fine_number
-            ).execute()
+            logger.debug("Creating driver ID event for fine %s (ID: %s)", fine_number, fine_id)
+            event = self._build_driver_id_event(fine_number, driver_id_due_date)
             
-            if not events_result.get('items', []):
-                created_event = self.calendar_service.events().insert(
-                    calendarId='primary', body=event).execute()
+            if existing is None or event['summary'] not in existing:
+                # import_ is keyed on the event's iCalUID, so a repeat call
+                # updates the same event instead of creating a duplicate
+                created_event = self.calendar_service.events().import_(
+                    calendarId='primary', body=event, fields='id').execute()
                 
-                logger.info(f"Created driver ID calendar event for fine {fine_number} (event ID: {created_event.get('id')})")
+                logger.info("Created driver ID calendar event for fine %s (event ID: %s)", fine_number, created_event.get('id'))
                 
                 # Update the database
                 self.fine_model.mark_driver_id_event_created(fine_id)
                 return True
             else:
-                logger.debug(f"Driver ID event for fine {fine_number} already exists, skipping")
+                logger.debug("Driver ID event for fine %s already exists, skipping", fine_number)
                 return False
-        except HttpError as e:
+        except Exception as e:
             logger.error(ErrorMessageMapper.get_log_message(e, {
                 'operation': 'create_driver_id_event',
                 'fine_number': fine_number,
                 'fine_id': fine_id
             }), exc_info=True)
             return False
+    
+    def _sync_event_index(self, calendar_id='primary'):
+        """
+        Bring the local index of this app's Calendar events up to date.
+        
+        The first run lists the whole calendar once; later runs pass the
+        stored sync token and only receive what changed since. An expired
+        token (HTTP 410) falls back to a full listing.
+        
+        An index synced less than EVENT_INDEX_TTL ago, by this process or a
+        previous run, is reused without any request.
+        
+        Returns:
+            Set of summaries of the app's events in the calendar
+        """
+        cached = self._event_index_cache.get(calendar_id)
+        if cached is not None and time.monotonic() - cached[1] < EVENT_INDEX_TTL:
+            return cached[0]
+        
+        if self.fine_model.is_calendar_index_fresh(calendar_id, EVENT_INDEX_TTL):
+            summaries = self.fine_model.get_calendar_event_summaries(calendar_id)
+            self._event_index_cache[calendar_id] = (summaries, time.monotonic())
+            return summaries
+        
+        sync_token = self.fine_model.get_calendar_sync_token(calendar_id)
+        try:
+            upserts, deletions, next_token = self._list_event_changes(calendar_id, sync_token)
         except Exception as e:
-            logger.error(ErrorMessageMapper.get_log_message(e, {
-                'operation': 'create_driver_id_event',
-                'fine_number': fine_number,
+            if sync_token is None or getattr(getattr(e, 'resp', None), 'status', None) != 410:
+                raise
+            logger.info("Calendar sync token expired, running a full sync")
+            sync_token = None
+            upserts, deletions, next_token = self._list_event_changes(calendar_id, None)
+        
+        self.fine_model.apply_calendar_sync(
+            calendar_id, upserts, deletions, next_token, full=sync_token is None
+        )
+        summaries = self.fine_model.get_calendar_event_summaries(calendar_id)
+        self._event_index_cache[calendar_id] = (summaries, time.monotonic())
+        return summaries
+    
+    def _list_event_changes(self, calendar_id, sync_token):
+        """
+        Page through events.list, fully or incrementally from sync_token.
+        
+        Returns:
+            Tuple of (upserts, deletions, next_sync_token) where upserts are
+            (event_id, summary) pairs for the app's events
+        """
+        upserts = []
+        deletions = []
+        page_token = None
+        while True:
+            params = {
+                'calendarId': calendar_id,
+                'maxResults': 2500,
+                # The app only creates one-off events, so recurring events
+                # are listed once rather than expanded into every instance
+                'singleEvents': False,
+                'pageToken': page_token,
+                'fields': EVENT_LIST_FIELDS,
+            }
+            if sync_token:
+                params['syncToken'] = sync_token
+            events_result = self.calendar_service.events().list(**params).execute()
+            
+            for event in events_result.get('items', []):
+                summary = event.get('summary', '')
+                if event.get('status') != 'cancelled' and summary.startswith(EVENT_PREFIXES):
+                    upserts.append((event['id'], summary))
+                elif sync_token:
+                    deletions.append(event['id'])
+            
+            page_token = events_result.get('nextPageToken')
+            if not page_token:
+                logger.debug(f"Calendar sync listed {len(upserts)} app events, {len(deletions)} removals")
+                return upserts, deletions, events_result.get('nextSyncToken')
+    
+    def _insert_events_batched(self, pending, results, created_ids, progress=None):
+        """
+        Insert events through the Calendar batch endpoint, BATCH_SIZE per request.
+        
+        When there is more than one batch, up to BATCH_WORKERS batches are
+        sent concurrently, each worker thread using its own service object.
+        
+        Args:
+            pending: List of (event_body, fine_id, kind) tuples, kind being
+                'payment' or 'driver_id'
+            results: Results dict updated in place with created/skipped counts
+            created_ids: Dict of 'payment' / 'driver_id' lists of fine IDs
+                to flag as created; inserted fines are added to it and all of
+                them are written to the database in one transaction at the end
+            progress: Optional callable(done, total), called on this thread
+                after each batch completes
+        """
+        callback = functools.partial(self._on_insert, results, created_ids, threading.Lock())
+        chunks = [pending[start:start + BATCH_SIZE] for start in range(0, len(pending), BATCH_SIZE)]
+        try:
+            done = 0
+            if len(chunks) <= 1 or self.credentials is None:
+                for chunk in chunks:
+                    self._execute_batch(self.calendar_service, chunk, callback)
+                    done += len(chunk)
+                    if progress:
+                        progress(done, len(pending))
+            else:
+                with ThreadPoolExecutor(max_workers=min(BATCH_WORKERS, len(chunks))) as executor:
+                    futures = {
+                        executor.submit(self._execute_batch, None, chunk, callback): len(chunk)
+                        for chunk in chunks
+                    }
+                    for future in as_completed(futures):
+                        future.result()
+                        done += futures[future]
+                        if progress:
+                            progress(done, len(pending))
+        finally:
+            # Record whatever was created, even if a later batch failed,
+            # so the next run does not insert those events again
+            self.fine_model.bulk_mark_events(created_ids['payment'], created_ids['driver_id'])
+    
+    def _execute_batch(self, service, chunk, callback):
+        """Send one batch of event inserts, using the calling thread's service if none is given"""
+        service = service or self._get_thread_service()
+        batch = service.new_batch_http_request(callback=callback)
+        for event, fine_id, kind in chunk:
+            batch.add(
+                service.events().import_(calendarId='primary', body=event, fields='id'),
+                request_id=f'{fine_id}:{kind}'
+            )
+        batch.execute()
+    
+    def _get_thread_service(self):
+        """Return a Calendar service owned by the calling thread, built from the stored credentials"""
+        service = getattr(self._thread_local, 'service', None)
+        if service is None or self._thread_local.credentials is not self.credentials:
+            service = _build_calendar_service(self.credentials)
+            self._thread_local.service = service
+            self._thread_local.credentials = self.credentials
+        return service
+    
+    def _on_insert(self, results, created_ids, lock, request_id, response, exception):
+        """Batch callback: record the outcome of a single event insert"""
+        fine_id, kind = request_id.split(':', 1)
+        if exception is not None:
+            logger.error(ErrorMessageMapper.get_log_message(exception, {
+                'operation': f'create_{kind}_event',
                 'fine_id': fine_id
-            }), exc_info=True)
-            return False
+            }))
+            with lock:
+                results[f'{kind}_events']['skipped'] += 1
+            return
+        
+        logger.info("Created %s calendar event for fine ID %s (event ID: %s)", kind, fine_id, response.get('id'))
+        with lock:
+            created_ids[kind].append(int(fine_id))
+            results[f'{kind}_events']['created'] += 1
     
-    def create_calendar_events(self):
-        """Create Google Calendar events for all pending fines"""
+    def create_calendar_events(self, progress=None):
+        """
+        Create Google Calendar events for all pending fines.
+        
+        Args:
+            progress: Optional callable(done, total) reporting how many of the
+                events to create have been sent. Called from the thread
+                running this method.
+        """
         if self.calendar_service is None:
             raise Exception("Calendar service not available. Please re-authenticate with Google Calendar.")
         
@@ -248,23 +535,51 @@ class CalendarIntegration:
         }
         
         try:
-            # Process payment events
             payment_fines = self.fine_model.get_fines_without_payment_events()
-            logger.info(f"Found {len(payment_fines)} fines without payment events")
-            for fine_id, fine_number, due_date, amount in payment_fines:
-                if self.create_payment_event(fine_id, fine_number, due_date, amount):
-                    results['payment_events']['created'] += 1
-                else:
-                    results['payment_events']['skipped'] += 1
-            
-            # Process driver ID events
             driver_id_fines = self.fine_model.get_fines_without_driver_id_events()
+            logger.info(f"Found {len(payment_fines)} fines without payment events")
             logger.info(f"Found {len(driver_id_fines)} fines without driver ID events")
-            for fine_id, fine_number, driver_id_due_date in driver_id_fines:
-                if self.create_driver_id_event(fine_id, fine_number, driver_id_due_date):
-                    results['driver_id_events']['created'] += 1
+            
+            # Duplicate checks are answered from the locally synced event
+            # index instead of a request per fine
+            existing = self._sync_event_index() if payment_fines or driver_id_fines else set()
+            
+            # Collect the events to insert, then send them in batches. Fines
+            # whose event is already in the calendar are flagged as created so
+            # later runs stop considering them.
+            pending = []
+            payment_present = []
+            driver_id_present = []
+            for fine in payment_fines:
+                fine_id, fine_number = fine['id'], fine['fine_number']
+                event = self._build_payment_event(fine_number, fine['defense_due_date'], fine['amount'])
+                if event['summary'] in existing:
+                    logger.debug("Payment event for fine %s already exists, skipping", fine_number)
+                    results['payment_events']['skipped'] += 1
+                    payment_present.append(fine_id)
                 else:
+                    pending.append((event, fine_id, 'payment'))
+            
+            for fine in driver_id_fines:
+                fine_id, fine_number = fine['id'], fine['fine_number']
+                event = self._build_driver_id_event(fine_number, fine['driver_id_due_date'])
+                if event['summary'] in existing:
+                    logger.debug("Driver ID event for fine %s already exists, skipping", fine_number)
                     results['driver_id_events']['skipped'] += 1
+                    driver_id_present.append(fine_id)
+                else:
+                    pending.append((event, fine_id, 'driver_id'))
+            
+            created_ids = {'payment': payment_present, 'driver_id': driver_id_present}
+            try:
+                self._insert_events_batched(pending, results, created_ids, progress)
+            finally:
+                # Keep the cached index in step with what was just created
+                # (existing is the cached set itself)
+                created = {(fine_id, kind) for kind, ids in created_ids.items() for fine_id in ids}
+                existing.update(
+                    event['summary'] for event, fine_id, kind in pending if (fine_id, kind) in created
+                )
             
             logger.info(f"Calendar events creation complete. Payment: {results['payment_events']}, Driver ID: {results['driver_id_events']}")
             return results
@@ -276,19 +591,49 @@ class CalendarIntegration:
         """
         Get the email address of the authenticated user.
         
+        The result is cached for USER_EMAIL_TTL seconds and dropped on
+        re-authentication or on a failed lookup.
+        
         Returns:
             User's email address as string, or None if not authenticated or error occurs
         """
         if self.calendar_service is None:
             return None
         
+        # The tab asks for this several times while refreshing its status;
+        # reuse a recent answer instead of a round-trip each time
+        cached = self._user_email_cache
+        if cached is not None and time.monotonic() - cached[1] < USER_EMAIL_TTL:
+            return cached[0]
+        
         try:
             # Get the primary calendar which contains the owner's email
-            calendar = self.calendar_service.calendars().get(calendarId='primary').execute()
-            return calendar.get('id')  # The calendar ID for primary is the user's email
-        except HttpError as e:
-            logger.error(f"Failed to get user email: {e}", exc_info=True)
-            return None
+            calendar = self.calendar_service.calendars().get(calendarId='primary', fields='id').execute()
+            email = calendar.get('id')  # The calendar ID for primary is the user's email
+            self._user_email_cache = (email, time.monotonic())
+            return email
         except Exception as e:
+            self._user_email_cache = None
             logger.error(f"Error getting user email: {e}", exc_info=True)
-            return None
\ No newline at end of file
+            return None
+
+# Global instance shared by every tab
+_default_integration = None
+_default_integration_lock = threading.Lock()
+
+
+def get_calendar_integration() -> CalendarIntegration:
+    """
+    Get or create the shared calendar integration instance.
+    
+    Returns:
+        CalendarIntegration instance
+    """
+    global _default_integration
+    
+    if _default_integration is None:
+        with _default_integration_lock:
+            if _default_integration is None:
+                _default_integration = CalendarIntegration()
+    
+    return _default_integration
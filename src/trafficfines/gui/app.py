@@ -1,10 +1,13 @@
 # gui/app.py
+import threading
 import tkinter as tk
 import tkinter.ttk as ttk
 from trafficfines.gui.import_tab import ImportTab
 from trafficfines.gui.fines_tab import FinesTab
 from trafficfines.gui.calendar_tab import CalendarTab
 
+__all__ = ['TrafficFineApp']
+
 class TrafficFineApp:
     def __init__(self, root):
         self.root = root
@@ -15,9 +18,10 @@ class TrafficFineApp:
         # Apply 'clam' theme for modern appearance
         self.setup_theme()
         
-        # Create shared calendar integration instance
-        from trafficfines.gcal_integration.integration import CalendarIntegration
-        self.calendar_integration = CalendarIntegration()
+        # Shared calendar integration instance; it does no network work
+        # until initialized below, off the Tk thread
+        from trafficfines.gcal_integration.integration import get_calendar_integration
+        self.calendar_integration = get_calendar_integration()
         
         # Ensure the window is properly configured
         self.root.update_idletasks()
@@ -27,6 +31,18 @@ class TrafficFineApp:
         
         # Ensure the window is ready to be shown
         self.root.update()
+        
+        # Load credentials and build the calendar service in the background
+        # so the window is usable immediately
+        threading.Thread(target=self.calendar_integration.initialize, daemon=True).start()
+        self._poll_calendar_ready()
+    
+    def _poll_calendar_ready(self):
+        """Notify the calendar tab from the Tk thread once initialization is done"""
+        if self.calendar_integration.is_initialized():
+            self.calendar_tab.on_integration_ready()
+        else:
+            self.root.after(100, self._poll_calendar_ready)
     
     def setup_theme(self):
         """Apply the 'clam' theme to all ttk widgets"""
@@ -1,7 +1,7 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 import threading
-from trafficfines.gcal_integration.integration import CalendarIntegration
+from concurrent.futures import Future
 from trafficfines.utils.logger import get_logger
 from trafficfines.utils.error_messages import ErrorMessageMapper
 from trafficfines.utils.helpers import format_datetime
@@ -10,13 +10,25 @@ logger = get_logger(__name__)
 
 
 class CalendarTab(ttk.Frame):
-    def __init__(self, parent, calendar_integration=None):
+    def __init__(self, parent, calendar_integration):
+        """
+        Args:
+            parent: Parent widget (the notebook)
+            calendar_integration: Shared CalendarIntegration owned by the app
+        """
         super().__init__(parent, padding="10")
-        self.calendar_integration = calendar_integration or CalendarIntegration()
+        self.calendar_integration = calendar_integration
         self.on_events_created = None  # Callback to notify when events are created
+        # Set when the user email should be looked up once the tab is shown
+        self._email_pending = False
+        # Latest (done, total) from the event creation worker, drained by
+        # _poll_future on the Tk thread
+        self._progress = None
+        self._progress_lock = threading.Lock()
         # Get root window reference
         self.root = self._get_root()
         self.create_widgets()
+        self.bind("<Map>", self._on_map)
     
     def _get_root(self):
         """Get the root Tk window"""
@@ -148,27 +160,73 @@ class CalendarTab(ttk.Frame):
         # Show progress indicator
         self.progress_frame.pack(pady=10, fill=tk.X, padx=20)
         self.progress_label.config(text="Creating calendar events...")
+        self.progress_bar.config(mode='indeterminate', value=0)
         self.progress_bar.start()
         self.update_status("Processing...", "Processing...")
-        self.update_idletasks()
         
-        # Run event creation in separate thread to prevent UI freezing
-        def create_events_thread():
+        # Run event creation off the Tk thread to prevent UI freezing
+        future = self._run_in_background(
+            self.calendar_integration.create_calendar_events,
+            progress=self._set_progress
+        )
+        self._poll_future(future, self._on_events_future_done)
+    
+    def _run_in_background(self, fn, *args, **kwargs):
+        """
+        Run a blocking calendar call on a daemon thread.
+        
+        Daemon threads don't keep the process alive, so closing the window
+        during a pending OAuth flow exits the app instead of hanging.
+        
+        Returns:
+            Future completed with the call's result or exception
+        """
+        future = Future()
+        
+        def worker():
             try:
-                # Create events
-                results = self.calendar_integration.create_calendar_events()
-                
-                # Update UI on main thread
-                self.root.after(0, lambda: self._finish_event_creation(results))
-                
-            except Exception as e:
-                logger.error(f"Failed to create calendar events: {e}", exc_info=True)
-                user_message = ErrorMessageMapper.format_error_for_user(e, {'operation': 'create_calendar_events'})
-                self.root.after(0, lambda: messagebox.showerror("Erro", user_message))
-                self.root.after(0, lambda: self._finish_event_creation(None, error=True))
-        
-        thread = threading.Thread(target=create_events_thread, daemon=True)
-        thread.start()
+                future.set_result(fn(*args, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+        
+        threading.Thread(target=worker, daemon=True).start()
+        return future
+    
+    def _set_progress(self, done, total):
+        """Record worker progress; Tk must not be called from this thread"""
+        with self._progress_lock:
+            self._progress = (done, total)
+    
+    def _poll_future(self, future, callback):
+        """Call callback(future) on the Tk thread once future has finished"""
+        with self._progress_lock:
+            progress, self._progress = self._progress, None
+        if progress is not None:
+            self._update_progress(*progress)
+        if future.done():
+            callback(future)
+        else:
+            self.after(100, self._poll_future, future, callback)
+    
+    def _on_events_future_done(self, future):
+        """Handle the outcome of create_calendar_events"""
+        try:
+            results = future.result()
+        except Exception as e:
+            logger.error(f"Failed to create calendar events: {e}", exc_info=True)
+            user_message = ErrorMessageMapper.format_error_for_user(e, {'operation': 'create_calendar_events'})
+            messagebox.showerror("Erro", user_message)
+            self._finish_event_creation(None, error=True)
+            return
+        self._finish_event_creation(results)
+    
+    def _update_progress(self, done, total):
+        """Show how many events have been sent (runs on the Tk thread)"""
+        if str(self.progress_bar.cget('mode')) != 'determinate':
+            self.progress_bar.stop()
+            self.progress_bar.config(mode='determinate', maximum=total)
+        self.progress_bar.config(value=done)
+        self.progress_label.config(text=f"Creating calendar events... {done}/{total}")
     
     def _finish_event_creation(self, results, error=False):
         """Finish event creation and update UI"""
@@ -214,27 +272,54 @@ class CalendarTab(ttk.Frame):
         status['created_var'].set(created_text)
         status['skipped_var'].set(skipped_text)
     
+    def on_integration_ready(self):
+        """Refresh the tab once the calendar integration has been initialized"""
+        self.update_auth_status()
+        self.update_auth_button_state()
+    
+    def _on_map(self, event):
+        """Run lookups that were deferred while the tab was hidden"""
+        if event.widget is self and self._email_pending:
+            self.update_user_email()
+    
     def update_user_email(self):
-        """Update the displayed user email"""
+        """
+        Update the displayed user email.
+        
+        The lookup is a Calendar API call, so it waits until the tab is
+        visible and then runs on a background thread.
+        """
         # Check if label exists (may not be created yet during initialization)
         if not hasattr(self, 'user_email_label'):
             return
             
-        if self.calendar_integration.is_authenticated():
-            email = self.calendar_integration.get_user_email()
-            if email:
-                self.user_email_var.set(f"Connected as: {email}")
-                self.user_email_label.pack(pady=(0, 5), padx=10)
-            else:
-                self.user_email_var.set("")
-                self.user_email_label.pack_forget()
+        if not self.calendar_integration.is_authenticated():
+            self._email_pending = False
+            self._show_user_email(None)
+            return
+        
+        if not self.winfo_ismapped():
+            self._email_pending = True
+            return
+        
+        self._email_pending = False
+        future = self._run_in_background(self.calendar_integration.get_user_email)
+        self._poll_future(future, lambda f: self._show_user_email(f.result()))
+    
+    def _show_user_email(self, email):
+        """Show or hide the connected account label"""
+        if email:
+            self.user_email_var.set(f"Connected as: {email}")
+            self.user_email_label.pack(pady=(0, 5), padx=10)
         else:
             self.user_email_var.set("")
             self.user_email_label.pack_forget()
     
     def update_auth_status(self):
         """Update authentication status display"""
-        if self.calendar_integration.is_authenticated():
+        if not self.calendar_integration.is_initialized():
+            self.auth_status_var.set("… Connecting to Google Calendar")
+        elif self.calendar_integration.is_authenticated():
             self.auth_status_var.set("✓ Authenticated - Calendar features are available")
         else:
             self.auth_status_var.set("✗ Not authenticated - Please re-authenticate to use calendar features")
@@ -251,20 +336,24 @@ class CalendarTab(ttk.Frame):
     
     def reauthenticate(self):
         """Handle re-authentication with Google Calendar"""
+        # Disable button during authentication
+        self.reauth_btn.config(state=tk.DISABLED, text="Authenticating...")
+        
+        # Show info message
+        messagebox.showinfo(
+            "Re-authentication",
+            "A browser window will open for you to authorize the application.\n\n"
+            "Please complete the authorization in your browser."
+        )
+        
+        # The OAuth flow waits on the browser, so keep it off the Tk thread
+        future = self._run_in_background(self.calendar_integration.reauthenticate)
+        self._poll_future(future, self._on_reauth_future_done)
+    
+    def _on_reauth_future_done(self, future):
+        """Report the outcome of reauthenticate"""
         try:
-            # Disable button during authentication
-            self.reauth_btn.config(state=tk.DISABLED, text="Authenticating...")
-            self.update_idletasks()
-            
-            # Show info message
-            messagebox.showinfo(
-                "Re-authentication",
-                "A browser window will open for you to authorize the application.\n\n"
-                "Please complete the authorization in your browser."
-            )
-            
-            # Perform re-authentication
-            success = self.calendar_integration.reauthenticate()
+            success = future.result()
             
             if success:
                 messagebox.showinfo(
@@ -301,4 +390,4 @@ class CalendarTab(ttk.Frame):
             messagebox.showerror("Erro", user_message)
         finally:
             # Re-enable button
-            self.reauth_btn.config(state=tk.NORMAL, text="Re-authenticate with Google Calendar")
\ No newline at end of file
+            self.reauth_btn.config(state=tk.NORMAL, text="Re-authenticate with Google Calendar")
@@ -9,11 +9,44 @@ import sys
 from trafficfines.db.models import FineModel
 from trafficfines.utils.helpers import format_currency, format_date, format_datetime
 
+# Filter combobox entries mapped to FineModel.query_fines statuses
+STATUS_FILTERS = {
+    "All": None,
+    "Pending Payment": 'pending_payment',
+    "Pending Driver ID": 'pending_driver_id',
+    "Complete": 'complete',
+}
+
+# Fines list columns; all share one width
+COLUMNS = ("Fine Number", "Issue Date", "Driver ID Due Date", "Amount", "License Plate", "Payment Event", "Driver ID Event")
+COLUMN_WIDTH = 100
+
+# Delay after the last keystroke before the search runs
+SEARCH_DEBOUNCE_MS = 250
+
+# Formatted rows kept between refreshes; dropped wholesale beyond this size
+ROW_CACHE_LIMIT = 20000
+
+# Rows added to the tree at a time; more are added as the list is scrolled
+# towards its end
+PAGE_SIZE = 200
+
 class FinesTab(ttk.Frame):
     def __init__(self, parent, calendar_integration=None):
         super().__init__(parent, padding="10")
         self.fine_model = FineModel()
         self.calendar_integration = calendar_integration
+        self._search_after_id = None  # Pending debounced search refresh
+        # Display values keyed by the raw row they were formatted from, so a
+        # changed fine simply misses the cache
+        self._row_cache = {}
+        # Filter of the rows in the tree and how many of them are loaded;
+        # each page is a separate query, so no cursor stays open between
+        # scroll events
+        self._query = None
+        self._loaded_count = 0
+        self._more_rows = False
+        self._page_pending = False
         self.create_widgets()
         self.refresh_fines_list()
     
@@ -26,7 +59,7 @@ class FinesTab(ttk.Frame):
         
         self.filter_var = tk.StringVar(value="All")
         filter_combo = ttk.Combobox(filter_frame, textvariable=self.filter_var, 
-                                    values=["All", "Pending Payment", "Pending Driver ID", "Complete"])
+                                    values=list(STATUS_FILTERS))
         filter_combo.pack(side=tk.LEFT, padx=(0, 10))
         filter_combo.bind("<<ComboboxSelected>>", lambda e: self.refresh_fines_list())
         
@@ -38,25 +71,24 @@ class FinesTab(ttk.Frame):
         self.search_var = tk.StringVar()
         search_entry = ttk.Entry(search_frame, textvariable=self.search_var, width=20)
         search_entry.pack(side=tk.LEFT)
-        search_entry.bind("<KeyRelease>", lambda e: self.refresh_fines_list())
+        search_entry.bind("<KeyRelease>", lambda e: self._schedule_search())
         
         # Create treeview with scrollbars
         treeview_frame = ttk.Frame(self)
         treeview_frame.pack(fill=tk.BOTH, expand=True)
         
-        # Define columns
-        columns = ("Fine Number", "Issue Date", "Driver ID Due Date", "Amount", "License Plate", "Payment Event", "Driver ID Event")
-        self.tree = ttk.Treeview(treeview_frame, columns=columns, show="headings")
+        self.tree = ttk.Treeview(treeview_frame, columns=COLUMNS, show="headings")
         
         # Define headings
-        for col in columns:
+        for col in COLUMNS:
             self.tree.heading(col, text=col)
-            self.tree.column(col, width=100)
+            self.tree.column(col, width=COLUMN_WIDTH)
         
         # Add scrollbars
         vsb = ttk.Scrollbar(treeview_frame, orient=tk.VERTICAL, command=self.tree.yview)
         hsb = ttk.Scrollbar(treeview_frame, orient=tk.HORIZONTAL, command=self.tree.xview)
-        self.tree.configure(yscrollcommand=vsb.set, xscrollcommand=hsb.set)
+        self._vsb = vsb
+        self.tree.configure(yscrollcommand=self._on_tree_yscroll, xscrollcommand=hsb.set)
         
         self.tree.grid(row=0, column=0, sticky=(tk.N, tk.S, tk.E, tk.W))
         vsb.grid(row=0, column=1, sticky=(tk.N, tk.S))
@@ -78,51 +110,68 @@ class FinesTab(ttk.Frame):
         # Double-click event
         self.tree.bind("<Double-1>", lambda e: self.view_fine_details())
     
+    def _schedule_search(self):
+        """Refresh once typing pauses instead of on every keystroke"""
+        if self._search_after_id:
+            self.after_cancel(self._search_after_id)
+        self._search_after_id = self.after(SEARCH_DEBOUNCE_MS, self.refresh_fines_list)
+    
     def refresh_fines_list(self):
         """Refresh the fines list with optional filtering and searching"""
-        # Clear current items
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        
-        # Load fines from database
-        fines = self.fine_model.get_all_fines()
-        
-        # Apply filter
-        filter_value = self.filter_var.get()
-        search_text = self.search_var.get().lower()
-        
+        if self._search_after_id:
+            # Covers any search still waiting to run
+            self.after_cancel(self._search_after_id)
+            self._search_after_id = None
+        
+        # Clear current items in a single Tcl call
+        self.tree.delete(*self.tree.get_children())
+        
+        # Load only the matching fines, a page at a time; filtering and
+        # search run in SQL
+        self._query = {
+            'status': STATUS_FILTERS.get(self.filter_var.get()),
+            'search': self.search_var.get().strip()
+        }
+        self._loaded_count = 0
+        self._more_rows = True
+        self._show_next_page()
+    
+    def _format_row(self, fine):
+        """Return the display values for a fine, reusing earlier formatting"""
+        cache = self._row_cache
+        key = tuple(fine)
+        values = cache.get(key)
+        if values is None:
+            if len(cache) >= ROW_CACHE_LIMIT:
+                cache.clear()
+            values = cache[key] = (
+                fine['fine_number'],
+                format_date(fine['notification_date']),  # "" for NULL
+                format_date(fine['driver_id_due_date']),
+                format_currency(fine['amount']),
+                fine['license_plate'] or "",
+                "Created" if fine['payment_event_created'] else "Pending",
+                "Created" if fine['driver_id_event_created'] else "Pending"
+            )
+        return values
+    
+    def _show_next_page(self):
+        """Add the next PAGE_SIZE rows of the current query to the tree"""
+        self._page_pending = False
+        fines = self.fine_model.query_fines(limit=PAGE_SIZE, offset=self._loaded_count, **self._query)
+        insert = self.tree.insert
         for fine in fines:
-            fine_number = fine['fine_number']
-            notification_date = format_date(fine['notification_date']) if fine['notification_date'] else ""
-            driver_id_due_date = format_date(fine['driver_id_due_date']) if fine['driver_id_due_date'] else ""
-            amount = format_currency(fine['amount'])
-            license_plate = fine['license_plate'] if fine['license_plate'] else ""
-            payment_status = "Created" if fine['payment_event_created'] else "Pending"
-            driver_id_status = "Created" if fine['driver_id_event_created'] else "Pending"
-            
-            # Apply filter
-            if filter_value == "Pending Payment" and fine['payment_event_created']:
-                continue
-            elif filter_value == "Pending Driver ID" and fine['driver_id_event_created']:
-                continue
-            elif filter_value == "Complete" and (not fine['payment_event_created'] or not fine['driver_id_event_created']):
-                continue
-            
-            # Apply search
-            if search_text:
-                search_fields = [
-                    str(fine_number).lower(),
-                    str(notification_date).lower(),
-                    str(driver_id_due_date).lower(),
-                    str(license_plate).lower()
-                ]
-                if not any(search_text in field for field in search_fields):
-                    continue
-            
-            self.tree.insert("", tk.END, values=(
-                fine_number, notification_date, driver_id_due_date, amount, 
-                license_plate, payment_status, driver_id_status
-            ))
+            insert("", tk.END, values=self._format_row(fine))
+        self._loaded_count += len(fines)
+        self._more_rows = len(fines) == PAGE_SIZE
+    
+    def _on_tree_yscroll(self, first, last):
+        """Update the scrollbar and load another page near the end of the list"""
+        self._vsb.set(first, last)
+        if float(last) >= 0.9 and self._more_rows and not self._page_pending:
+            # Not from inside the scroll callback, which the insert would re-trigger
+            self._page_pending = True
+            self.after_idle(self._show_next_page)
     
     def view_fine_details(self):
         """Show details of selected fine in a popup window"""
@@ -2,17 +2,56 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import os
+import queue
 import threading
 
 from trafficfines.config import DEFAULT_PDF_FOLDER
-from trafficfines.pdf.parser import PDFParser
 from trafficfines.utils.helpers import format_currency, format_date, format_datetime
+from trafficfines.utils.pdf_cache import get_pdf_cache
 import datetime
 from trafficfines.utils.logger import get_logger
 from trafficfines.utils.error_messages import ErrorMessageMapper
 
 logger = get_logger(__name__)
 
+# Fines saved per transaction when processing, between progress updates
+PROCESS_CHUNK_SIZE = 100
+
+# Scan results listed per Tk event-loop pass, so a burst of cached results
+# does not hold up redraws
+SCAN_ROWS_PER_TICK = 50
+
+# Fields shown in the details window (Portuguese label, field key), in order
+_FIELD_MAPPING = (
+    ("IDENTIFICAÇÃO DO AUTO DE INFRAÇÃO (Número do AIT)", "fine_number"),
+    ("DATA DA NOTIFICAÇÃO DA AUTUAÇÃO", "notification_date"),
+    ("DATA LIMITE PARA INTERPOSIÇÃO DE DEFESA PRÉVIA", "defense_due_date"),
+    ("DATA LIMITE PARA IDENTIFICAÇÃO DO CONDUTOR INFRATOR", "driver_id_due_date"),
+    ("PLACA", "license_plate"),
+    ("MARCA/MODELO/VERSÃO", "vehicle_model"),
+    ("LOCAL DA INFRAÇÃO", "violation_location"),
+    ("DATA", "violation_date"),
+    ("HORA", "violation_time"),
+    ("CÓDIGO DA INFRAÇÃO", "violation_code"),
+    ("VALOR DA MULTA", "amount"),
+    ("DESCRIÇÃO DA INFRAÇÃO", "description"),
+    ("MEDIÇÃO REALIZADA", "measured_speed"),
+    ("VALOR CONSIDERADO", "considered_speed"),
+    ("LIMITE REGULAMENTADO", "speed_limit"),
+    ("NOME DO PROPRIETÁRIO", "owner_name"),
+    ("CPF/CNPJ", "owner_document"),
+)
+
+# Scan results columns and their widths
+FILE_COLUMNS = {
+    "Arquivo": 200,
+    "Auto de Infração": 150,
+    "Placa": 100,
+    "Valor": 100,
+    "Data": 100,
+    "Status": 100,
+}
+
 class ImportTab(ttk.Frame):
     # Define required fields for validation here
     REQUIRED_FIELDS = ['fine_number', 'license_plate', 'amount']  # <-- Change as needed
@@ -20,14 +59,52 @@ class ImportTab(ttk.Frame):
     def __init__(self, parent):
         super().__init__(parent, padding="10")
         
-        self.pdf_parser = PDFParser()
+        self._pdf_parser = None  # Built on first use, see pdf_parser
+        self._parse_executor = None  # Worker processes kept across scans
         self.on_fines_updated = None  # Callback to notify when fines are updated
-        self.compatible_files = []  # List to store compatible files
+        self.compatible_files = {}  # Parsed fine data of compatible files, by filename
+        self._details_window = None  # Reused by show_file_details while open
+        self._details_labels = {}
         # Get root window reference
         self.root = self._get_root()
         
         self.create_widgets()
     
+    @property
+    def pdf_parser(self):
+        """
+        PDF parser, created on first use.
+        
+        The parser module pulls in PyMuPDF and the parsing strategies, so it
+        is only imported once a folder is actually scanned.
+        """
+        if self._pdf_parser is None:
+            from trafficfines.pdf.parser import PDFParser
+            self._pdf_parser = PDFParser()
+        return self._pdf_parser
+    
+    @property
+    def parse_executor(self):
+        """
+        Process pool that scans parse in, created on first use.
+        
+        Its worker processes and their parsers outlive a single scan, so
+        rescanning does not pay for starting them again.
+        """
+        if self._parse_executor is None:
+            from trafficfines.pdf.parser import PARSE_WORKERS, create_parse_executor
+            self._parse_executor = create_parse_executor(
+                PARSE_WORKERS, self.pdf_parser.jurisdiction, self.pdf_parser.strict_validation
+            )
+        return self._parse_executor
+    
+    def destroy(self):
+        """Stop the parse worker processes along with the tab"""
+        if self._parse_executor is not None:
+            self._parse_executor.shutdown(wait=False, cancel_futures=True)
+            self._parse_executor = None
+        super().destroy()
+    
     def _get_root(self):
         """Get the root Tk window"""
         widget = self
@@ -80,18 +157,14 @@ class ImportTab(ttk.Frame):
         self.rowconfigure(5, weight=1)
         
         # Create treeview for files
-        columns = ("Arquivo", "Auto de Infração", "Placa", "Valor", "Data", "Status")
-        self.files_tree = ttk.Treeview(self.result_frame, columns=columns, show="headings", selectmode="extended")
+        self.files_tree = ttk.Treeview(
+            self.result_frame, columns=tuple(FILE_COLUMNS), show="headings", selectmode="extended"
+        )
         
         # Define headings
-        for col in columns:
+        for col, width in FILE_COLUMNS.items():
             self.files_tree.heading(col, text=col)
-            if col == "Arquivo":
-                self.files_tree.column(col, width=200)
-            elif col == "Auto de Infração":
-                self.files_tree.column(col, width=150)
-            else:
-                self.files_tree.column(col, width=100)
+            self.files_tree.column(col, width=width)
         
         # Add scrollbars
         vsb = ttk.Scrollbar(self.result_frame, orient=tk.VERTICAL, command=self.files_tree.yview)
@@ -118,7 +191,9 @@ class ImportTab(ttk.Frame):
             return
         
         # Count PDFs in the folder
-        pdf_count = sum(1 for f in os.listdir(folder) if f.lower().endswith('.pdf'))
+        from trafficfines.pdf.parser import list_pdf_files
+        pdf_files = list_pdf_files(folder)
+        pdf_count = len(pdf_files)
         
         if pdf_count == 0:
             messagebox.showinfo("Informação", "Nenhum arquivo PDF encontrado na pasta selecionada.")
@@ -131,21 +206,28 @@ class ImportTab(ttk.Frame):
         )
         
         if confirm:
-            self.scan_folder()
+            self.scan_folder(pdf_files)
     
-    def scan_folder(self):
-        """Scan folder and verify PDF files for required fields"""
+    def scan_folder(self, pdf_files=None):
+        """
+        Scan folder and verify PDF files for required fields.
+        
+        Args:
+            pdf_files: PDF file names already listed by the caller; the
+                folder is listed again only if omitted
+        """
         folder = self.folder_path.get()
         
         # Disable buttons during scan
         self.process_btn.config(state=tk.DISABLED)
         
         # Clear previous results
-        for item in self.files_tree.get_children():
-            self.files_tree.delete(item)
+        self.files_tree.delete(*self.files_tree.get_children())
         
         # Get list of PDF files first
-        pdf_files = [f for f in os.listdir(folder) if f.lower().endswith('.pdf')]
+        from trafficfines.pdf.parser import PARSE_WORKERS, has_pdf_header, list_pdf_files
+        if pdf_files is None:
+            pdf_files = list_pdf_files(folder)
         
         if not pdf_files:
             messagebox.showinfo("Informação", "Nenhum arquivo PDF encontrado na pasta selecionada.")
@@ -160,52 +242,99 @@ class ImportTab(ttk.Frame):
         self.result_label.config(text="")
         self.update_idletasks()
         
-        # Run scan in separate thread to prevent UI freezing
+        # Parse in a separate thread; results are handed over through a queue
+        # and drained from the Tk loop, so each file shows up as soon as it
+        # has been parsed
+        self.compatible_files = {}
+        self._scan_queue = queue.Queue()
+        self._scan_counts = {'done': 0, 'total': len(pdf_files), 'incompatible': 0}
+        
         def scan_thread():
             try:
-                self.compatible_files = []
-                incompatible_files = []
-                
-                # Check each PDF file
-                for i, filename in enumerate(pdf_files):
+                # Files without a PDF header are reported without parsing, and
+                # unchanged files reuse their cached parse
+                cache = get_pdf_cache()
+                jurisdiction = self.pdf_parser.jurisdiction
+                to_parse = []
+                for filename in pdf_files:
                     pdf_path = os.path.join(folder, filename)
-                    
-                    # Update progress
-                    self.root.after(0, lambda i=i, total=len(pdf_files), name=filename: self._update_scan_progress(i + 1, total, name))
-                    
-                    fine_data = self.pdf_parser.parse_pdf(pdf_path)
-
-                    # Validation: check required fields
-                    missing_fields = [field for field in self.REQUIRED_FIELDS if not fine_data or not fine_data.get(field)]
-                    is_valid = fine_data is not None and not missing_fields
-
-                    if is_valid:
-                        self.compatible_files.append(fine_data)
-                        self.root.after(0, lambda f=filename, d=fine_data: self._add_file_to_tree(f, d, "Compatível"))
+                    if not has_pdf_header(pdf_path):
+                        self._scan_queue.put(('invalid', filename, None))
+                        continue
+                    fine_data = cache.get(pdf_path, jurisdiction)
+                    if fine_data is not None:
+                        self._scan_queue.put(('file', filename, fine_data))
                     else:
-                        missing = "Campos faltando" if fine_data else "Erro na análise"
-                        if missing_fields:
-                            missing = f"Faltando: {', '.join(missing_fields)}"
-                        incompatible_files.append(filename)
-                        self.root.after(0, lambda f=filename, m=missing: self._add_file_to_tree(f, None, m))
-                
-                # Update UI on main thread
-                self.root.after(0, lambda: self._finish_scan(len(self.compatible_files), len(incompatible_files)))
+                        to_parse.append(filename)
                 
+                executor = self.parse_executor if PARSE_WORKERS > 1 else None
+                for filename, fine_data in self.pdf_parser.iter_folder_pdfs(
+                        folder, to_parse, executor=executor):
+                    if fine_data is not None:
+                        cache.put(os.path.join(folder, filename), fine_data, jurisdiction)
+                    self._scan_queue.put(('file', filename, fine_data))
+                self._scan_queue.put(('done', None, None))
             except Exception as e:
                 logger.error(f"Error during folder scan: {e}", exc_info=True)
-                user_message = ErrorMessageMapper.format_error_for_user(e, {'operation': 'folder_scan', 'folder': folder})
-                self.root.after(0, lambda: messagebox.showerror("Erro", user_message))
-                self.root.after(0, lambda: self._finish_scan(0, 0, error=True))
+                self._scan_queue.put(('error', None, e))
         
         thread = threading.Thread(target=scan_thread, daemon=True)
         thread.start()
+        self.after(50, self._drain_scan_queue, folder)
+    
+    def _drain_scan_queue(self, folder):
+        """Show the scan results queued since the last call, then poll again"""
+        counts = self._scan_counts
+        for _ in range(SCAN_ROWS_PER_TICK):
+            try:
+                kind, filename, payload = self._scan_queue.get_nowait()
+            except queue.Empty:
+                break
+            
+            if kind == 'file':
+                counts['done'] += 1
+                self._update_scan_progress(counts['done'], counts['total'], filename)
+                self._add_scan_result(filename, payload)
+            elif kind == 'invalid':
+                counts['done'] += 1
+                counts['incompatible'] += 1
+                self._update_scan_progress(counts['done'], counts['total'], filename)
+                self._add_file_to_tree(filename, None, "Não é PDF válido")
+            elif kind == 'done':
+                self._finish_scan(len(self.compatible_files), counts['incompatible'])
+                return
+            else:
+                user_message = ErrorMessageMapper.format_error_for_user(payload, {'operation': 'folder_scan', 'folder': folder})
+                messagebox.showerror("Erro", user_message)
+                self._finish_scan(0, 0, error=True)
+                return
+        else:
+            # More results are waiting; continue once pending redraws are done
+            self.after_idle(self._drain_scan_queue, folder)
+            return
+        
+        self.after(50, self._drain_scan_queue, folder)
+    
+    def _add_scan_result(self, filename, fine_data):
+        """Validate one parsed file and list it as compatible or not"""
+        # Validation: check required fields
+        missing_fields = [field for field in self.REQUIRED_FIELDS if not fine_data or not fine_data.get(field)]
+        is_valid = fine_data is not None and not missing_fields
+        
+        if is_valid:
+            self.compatible_files[filename] = fine_data
+            self._add_file_to_tree(filename, fine_data, "Compatível")
+        else:
+            missing = "Campos faltando" if fine_data else "Erro na análise"
+            if missing_fields:
+                missing = f"Faltando: {', '.join(missing_fields)}"
+            self._scan_counts['incompatible'] += 1
+            self._add_file_to_tree(filename, None, missing)
     
     def _update_scan_progress(self, current, total, filename):
         """Update progress bar and label"""
         self.progress_bar['value'] = current
         self.progress_label.config(text=f"Verificando: {filename} ({current}/{total})")
-        self.update_idletasks()
     
     def _add_file_to_tree(self, filename, fine_data, status):
         """Add file to treeview"""
@@ -263,9 +392,12 @@ class ImportTab(ttk.Frame):
         self.progress_bar['maximum'] = len(self.compatible_files)
         self.progress_bar['value'] = 0
         self.progress_label.config(text="Processando arquivos...")
-        self.update_idletasks()
         
-        # Run processing in separate thread to prevent UI freezing
+        # Save in a separate thread; progress comes back through a queue that
+        # the Tk loop drains
+        fines = list(self.compatible_files.values())
+        self._process_queue = queue.Queue()
+        
         def process_thread():
             try:
                 from trafficfines.db.models import FineModel
@@ -273,32 +405,56 @@ class ImportTab(ttk.Frame):
                 processed_count = 0
                 failed_count = 0
                 
-                for i, fine_data in enumerate(self.compatible_files):
-                    # Update progress
-                    self.root.after(0, lambda i=i, total=len(self.compatible_files): self._update_process_progress(i + 1, total))
-                    
-                    if fine_model.save_fine(fine_data):
-                        processed_count += 1
+                # One transaction per chunk; only if a chunk fails, save its
+                # fines one by one so the good ones still go in and the bad
+                # ones are counted
+                for start in range(0, len(fines), PROCESS_CHUNK_SIZE):
+                    chunk = fines[start:start + PROCESS_CHUNK_SIZE]
+                    if fine_model.save_fines_bulk(chunk):
+                        processed_count += len(chunk)
                     else:
-                        failed_count += 1
-                
-                # Update UI on main thread
-                self.root.after(0, lambda: self._finish_processing(processed_count, failed_count))
+                        logger.warning("Bulk save failed, retrying fines one at a time")
+                        for fine_data in chunk:
+                            if fine_model.save_fine(fine_data):
+                                processed_count += 1
+                            else:
+                                failed_count += 1
+                    self._process_queue.put(('progress', start + len(chunk), len(fines)))
                 
+                self._process_queue.put(('done', processed_count, failed_count))
             except Exception as e:
                 logger.error(f"Error during file processing: {e}", exc_info=True)
-                user_message = ErrorMessageMapper.format_error_for_user(e, {'operation': 'file_processing'})
-                self.root.after(0, lambda: messagebox.showerror("Erro", user_message))
-                self.root.after(0, lambda: self._finish_processing(0, 0, error=True))
+                self._process_queue.put(('error', e, None))
         
         thread = threading.Thread(target=process_thread, daemon=True)
         thread.start()
+        self.after(50, self._drain_process_queue)
+    
+    def _drain_process_queue(self):
+        """Apply queued processing progress, then poll again until done"""
+        while True:
+            try:
+                kind, first, second = self._process_queue.get_nowait()
+            except queue.Empty:
+                break
+            
+            if kind == 'progress':
+                self._update_process_progress(first, second)
+            elif kind == 'done':
+                self._finish_processing(first, second)
+                return
+            else:
+                user_message = ErrorMessageMapper.format_error_for_user(first, {'operation': 'file_processing'})
+                messagebox.showerror("Erro", user_message)
+                self._finish_processing(0, 0, error=True)
+                return
+        
+        self.after(50, self._drain_process_queue)
     
     def _update_process_progress(self, current, total):
         """Update progress bar and label"""
         self.progress_bar['value'] = current
         self.progress_label.config(text=f"Processando arquivo {current}/{total}...")
-        self.update_idletasks()
     
     def _finish_processing(self, processed_count, failed_count, error=False):
         """Finish processing and update UI"""
@@ -336,59 +492,54 @@ class ImportTab(ttk.Frame):
             messagebox.showinfo("Informação", f"O arquivo {filename} não é compatível e não pode ser processado.")
             return
             
-        # Find the file data
-        pdf_path = os.path.join(self.folder_path.get(), filename)
-        fine_data = self.pdf_parser.parse_pdf(pdf_path)
+        # Use the data parsed during the scan
+        fine_data = self.compatible_files.get(filename)
+        if fine_data is None:
+            pdf_path = os.path.join(self.folder_path.get(), filename)
+            fine_data = get_pdf_cache().get(pdf_path, self.pdf_parser.jurisdiction)
+            if fine_data is None:
+                fine_data = self.pdf_parser.parse_pdf(pdf_path)
         
         if fine_data:
+            self._show_details_window(filename, fine_data)
+    
+    def _show_details_window(self, filename, fine_data):
+        """Show fine_data in the details window, reusing it if still open"""
+        window = self._details_window
+        if window is None or not window.winfo_exists():
             # Create a details window
-            details_window = tk.Toplevel(self)
-            details_window.title(f"Detalhes: {filename}")
-            details_window.geometry("600x500")
+            window = self._details_window = tk.Toplevel(self)
+            window.geometry("600x500")
             
             # Create frame with padding
-            frame = ttk.Frame(details_window, padding="20")
+            frame = ttk.Frame(window, padding="20")
             frame.pack(fill=tk.BOTH, expand=True)
             
-            # Field mappings (Portuguese name to field key)
-            field_mapping = {
-                "IDENTIFICAÇÃO DO AUTO DE INFRAÇÃO (Número do AIT)": "fine_number",
-                "DATA DA NOTIFICAÇÃO DA AUTUAÇÃO": "notification_date",
-                "DATA LIMITE PARA INTERPOSIÇÃO DE DEFESA PRÉVIA": "defense_due_date",
-                "DATA LIMITE PARA IDENTIFICAÇÃO DO CONDUTOR INFRATOR": "driver_id_due_date",
-                "PLACA": "license_plate",
-                "MARCA/MODELO/VERSÃO": "vehicle_model",
-                "LOCAL DA INFRAÇÃO": "violation_location",
-                "DATA": "violation_date",
-                "HORA": "violation_time",
-                "CÓDIGO DA INFRAÇÃO": "violation_code",
-                "VALOR DA MULTA": "amount",
-                "DESCRIÇÃO DA INFRAÇÃO": "description",
-                "MEDIÇÃO REALIZADA": "measured_speed",
-                "VALOR CONSIDERADO": "considered_speed",
-                "LIMITE REGULAMENTADO": "speed_limit",
-                "NOME DO PROPRIETÁRIO": "owner_name",
-                "CPF/CNPJ": "owner_document"
-            }
-            
-            # Display fields in order
+            # One label pair per field, in display order
+            self._details_labels = {}
             row = 0
-            for pt_field, field_key in field_mapping.items():
+            for pt_field, field_key in _FIELD_MAPPING:
                 ttk.Label(frame, text=f"{pt_field}:", font=("", 10, "bold")).grid(
                     row=row, column=0, sticky=tk.W, padx=5, pady=5)
-                
-                value = fine_data.get(field_key, "")
-                if field_key == "amount" and value:
-                    value = format_currency(value)
-                elif isinstance(value, datetime.date):
-                    value = format_date(value)
-                elif isinstance(value, datetime.datetime):
-                    value = format_datetime(value)
-                
-                value_label = ttk.Label(frame, text=str(value) if value else "Não disponível", wraplength=300)
+                value_label = ttk.Label(frame, wraplength=300)
                 value_label.grid(row=row, column=1, sticky=tk.W, padx=5, pady=5)
+                self._details_labels[field_key] = value_label
                 row += 1
                 
             # OK button
-            ttk.Button(frame, text="OK", command=details_window.destroy).grid(
-                row=row, column=0, columnspan=2, pady=20)
\ No newline at end of file
+            ttk.Button(frame, text="OK", command=window.destroy).grid(
+                row=row, column=0, columnspan=2, pady=20)
+        
+        window.title(f"Detalhes: {filename}")
+        for field_key, value_label in self._details_labels.items():
+            value = fine_data.get(field_key, "")
+            if field_key == "amount" and value:
+                value = format_currency(value)
+            elif isinstance(value, datetime.date):
+                value = format_date(value)
+            elif isinstance(value, datetime.datetime):
+                value = format_datetime(value)
+            
+            value_label.config(text=str(value) if value else "Não disponível")
+        window.deiconify()
+        window.lift()
@@ -4,6 +4,7 @@ Configuration-based field mapping system for PDF parsing.
 This module loads field mappings from JSON configuration files, allowing
 easy adaptation to different PDF formats and jurisdictions without code changes.
 """
+import hashlib
 import json
 import os
 from pathlib import Path
@@ -12,6 +13,14 @@ from trafficfines.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Canonical fields the parsing strategies turn into datetime.date. Kept here,
+# away from PyMuPDF, so modules that only handle parsed data can import it.
+DATE_FIELDS = frozenset(('notification_date', 'defense_due_date', 'driver_id_due_date', 'violation_date'))
+
+# Version of the parsing logic; bump it whenever a change can alter the data
+# extracted from a PDF, so cached results from older parsers are discarded
+PARSER_VERSION = 1
+
 
 class FieldMappingConfig:
     """Manages field mappings loaded from configuration files."""
@@ -80,6 +89,30 @@ class FieldMappingConfig:
         logger.debug(f"Using field mapping for jurisdiction: {jurisdiction} ({len(mapping)} fields)")
         return mapping
     
+    def mapping_fingerprint(self, jurisdiction: Optional[str] = None) -> str:
+        """
+        Short hash of the field mapping get_mapping would return.
+        
+        Any change to the mapping (add_mapping, an edited configuration file)
+        changes the hash, so data parsed under an older mapping can be told
+        apart. Field order is part of the hash because it decides which
+        header wins when several match.
+        
+        Args:
+            jurisdiction: Jurisdiction name. If None, uses current jurisdiction.
+        
+        Returns:
+            Hex digest string
+        """
+        if jurisdiction is None:
+            jurisdiction = self.current_jurisdiction
+        if jurisdiction not in self.mappings:
+            jurisdiction = 'brazil'
+        
+        mapping = self.mappings.get(jurisdiction, {})
+        encoded = json.dumps(list(mapping.items()), ensure_ascii=False).encode('utf-8')
+        return hashlib.sha1(encoded).hexdigest()[:16]
+    
     def set_jurisdiction(self, jurisdiction: str) -> bool:
         """
         Set current jurisdiction.
@@ -1,21 +1,61 @@
 # pdf/parser.py
+import functools
+import logging
+import multiprocessing
 import os
-try:
-    from icecream import ic
-except ImportError:
-    # Fallback if icecream is not installed
-    def ic(*args, **kwargs):
-        pass
-
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 from trafficfines.utils.logger import get_logger
 from trafficfines.utils.error_messages import ErrorMessageMapper
 from trafficfines.pdf.field_config import get_field_mapping_config
 from trafficfines.pdf.parsing_strategies import MultiStrategyParser
 from trafficfines.pdf.validator import FineDataValidator, validate_fine_data
+from trafficfines.utils.pdf_cache import get_pdf_cache
 from typing import Dict, List, Tuple
 
 logger = get_logger(__name__)
 
+# Worker processes for parallel parsing; past a few, disk reads dominate
+PARSE_WORKERS = min(os.cpu_count() or 1, 4)
+# Files submitted but not yet collected, so results never pile up in memory
+# faster than the consumer takes them
+MAX_IN_FLIGHT = 32
+
+# Parsed fines saved per transaction while a folder scan is running
+SAVE_BATCH_SIZE = 100
+
+# Every PDF file starts with this header
+PDF_MAGIC = b'%PDF-'
+
+
+def list_pdf_files(folder_path: str) -> List[str]:
+    """
+    Return the names of the .pdf files in a folder, in one directory pass.
+    
+    Hidden files are skipped, which also leaves out the "._name.pdf"
+    metadata files macOS writes next to PDFs on shared drives.
+    """
+    with os.scandir(folder_path) as entries:
+        return [
+            entry.name for entry in entries
+            # Lower-case only the suffix, not the whole name
+            if entry.name[-4:].lower() == '.pdf'
+            and not entry.name.startswith('.')
+            and entry.is_file()
+        ]
+
+
+def has_pdf_header(pdf_path: str) -> bool:
+    """
+    Cheap check that a file really is a PDF before handing it to the parser.
+    
+    Empty, truncated or misnamed files fail without being parsed.
+    """
+    try:
+        with open(pdf_path, 'rb') as f:
+            return f.read(len(PDF_MAGIC)) == PDF_MAGIC
+    except OSError:
+        return False
+
 
 class PDFParser:
     """
@@ -54,8 +94,7 @@ class PDFParser:
             Dictionary with extracted fine data or None if parsing fails
         """
         try:
-            logger.info(f"Parsing PDF: {pdf_path}")
-            ic(f"Parsing PDF: {pdf_path}")
+            logger.info("Parsing PDF: %s", pdf_path)
             
             if not os.path.exists(pdf_path):
                 raise FileNotFoundError(f"PDF file not found: {pdf_path}")
@@ -66,7 +105,8 @@ class PDFParser:
             if not fine_data:
                 raise ValueError("Could not extract fine number from PDF - file may not be a valid traffic fine document")
             
-            ic(fine_data)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Extracted fine data: %r", fine_data)
             
             # Validate extracted data (Solution C)
             if validate:
@@ -89,8 +129,7 @@ class PDFParser:
                     # Still return data, but log the issues
                     # In strict mode, we might want to return None here
             
-            logger.info(f"Successfully parsed PDF: {pdf_path} (fine_number: {fine_data.get('fine_number')})")
-            ic(f"Successfully parsed PDF: {pdf_path}")
+            logger.info("Successfully parsed PDF: %s (fine_number: %s)", pdf_path, fine_data.get('fine_number'))
             return fine_data
             
         except FileNotFoundError as e:
@@ -103,8 +142,96 @@ class PDFParser:
             logger.error(ErrorMessageMapper.get_log_message(e, {'pdf_path': pdf_path}), exc_info=True)
             return None
 
-    def scan_folder_for_pdfs(self, folder_path):
-        """Scan a folder for PDF files and process them"""
+    def iter_folder_pdfs(self, folder_path, filenames=None, workers=1, executor=None, cache=None):
+        """
+        Parse the PDFs in a folder, yielding each result as it is ready.
+        
+        Args:
+            folder_path: Folder containing the PDFs
+            filenames: Optional list of file names to parse; defaults to every
+                .pdf file in the folder that has a PDF header
+            workers: Number of processes to parse with. Parsing is CPU-bound,
+                so with more than one the files are spread over a
+                ProcessPoolExecutor and results come back in completion
+                order, with at most MAX_IN_FLIGHT files outstanding.
+            executor: Optional pool from create_parse_executor to parse in
+                instead of starting a new one; it is left running afterwards
+            cache: Optional PDFCache; unchanged files are served from it
+                without parsing, and new results are stored in it
+        
+        Yields:
+            (filename, fine_data) tuples; fine_data is None when parsing failed
+        """
+        if filenames is None:
+            filenames = []
+            for filename in list_pdf_files(folder_path):
+                if has_pdf_header(os.path.join(folder_path, filename)):
+                    filenames.append(filename)
+                else:
+                    logger.warning("Skipping %s: not a valid PDF file", filename)
+        
+        if cache is not None:
+            yield from self._iter_cached(cache, folder_path, filenames, workers, executor)
+            return
+        
+        if len(filenames) > 1 and executor is not None:
+            yield from self._iter_parsed_in_pool(executor, folder_path, filenames)
+            return
+        if len(filenames) > 1 and workers > 1:
+            workers = min(workers, len(filenames))
+            logger.info("Parsing %s files with %s worker processes", len(filenames), workers)
+            with create_parse_executor(workers, self.jurisdiction, self.strict_validation) as executor:
+                yield from self._iter_parsed_in_pool(executor, folder_path, filenames)
+            return
+        
+        for filename in filenames:
+            logger.info("Processing file: %s", filename)
+            yield filename, self.parse_pdf(os.path.join(folder_path, filename))
+
+    def _iter_cached(self, cache, folder_path, filenames, workers, executor):
+        """Yield cache hits first, then parse the remaining files and cache them"""
+        to_parse = []
+        for filename in filenames:
+            fine_data = cache.get(os.path.join(folder_path, filename), self.jurisdiction)
+            if fine_data is None:
+                to_parse.append(filename)
+            else:
+                yield filename, fine_data
+        
+        for filename, fine_data in self.iter_folder_pdfs(folder_path, to_parse, workers, executor):
+            if fine_data is not None:
+                cache.put(os.path.join(folder_path, filename), fine_data, self.jurisdiction)
+            yield filename, fine_data
+
+    def _iter_parsed_in_pool(self, executor, folder_path, filenames):
+        """Parse files in a process pool, yielding in completion order"""
+        parse = functools.partial(
+            parse_pdf_file, jurisdiction=self.jurisdiction, strict_validation=self.strict_validation
+        )
+        queued = iter(filenames)
+        in_flight = {}
+        while True:
+            # Top up to the in-flight limit, then wait for any result
+            for filename in queued:
+                in_flight[executor.submit(parse, os.path.join(folder_path, filename))] = filename
+                if len(in_flight) >= MAX_IN_FLIGHT:
+                    break
+            if not in_flight:
+                return
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield in_flight.pop(future), future.result()
+
+    def scan_folder_for_pdfs(self, folder_path, workers=PARSE_WORKERS):
+        """
+        Scan a folder for PDF files and process them.
+        
+        Files are parsed in up to `workers` processes; the results are saved
+        from this process, so only one connection ever writes to the database.
+        
+        Returns:
+            Dictionary with 'processed' filenames and 'errors'
+        """
         from trafficfines.db.models import FineModel
         
         fine_model = FineModel()
@@ -112,40 +239,46 @@ class PDFParser:
         errors = []
         
         logger.info(f"Scanning folder for PDFs: {folder_path}")
-        ic(f"Scanning folder for PDFs: {folder_path}")
-
-        for filename in os.listdir(folder_path):
-            if filename.lower().endswith('.pdf'):
-                pdf_path = os.path.join(folder_path, filename)
-                logger.info(f"Processing file: {filename}")
-                ic(f"Processing file: {filename}")
-                fine_data = self.parse_pdf(pdf_path)
-                
-                if fine_data and fine_data['fine_number']:
-                    try:
-                        ic(f"Attempting to save fine data: {fine_data}")  # Log the data being saved
-                        if fine_model.save_fine(fine_data):
-                            processed_files.append(filename)
-                            logger.info(f"Saved fine data for: {filename}")
-                            ic(f"Saved fine data for: {filename}")
-                        else:
-                            error_msg = f"Failed to save {filename} to database"
-                            errors.append(error_msg)
-                            logger.error(error_msg)
-                            ic(error_msg)
-                    except Exception as e:
-                        error_msg = f"Exception while saving {filename}: {e}"
-                        errors.append(error_msg)
-                        logger.error(ErrorMessageMapper.get_log_message(e, {'filename': filename}), exc_info=True)
-                        ic(error_msg)
+
+        parsed_files = []
+        fines_to_save = []
+        
+        def save_batch():
+            # Save the parsed fines collected so far in a single transaction
+            try:
+                logger.debug("Attempting to save %s fines", len(fines_to_save))
+                if fine_model.save_fines_bulk(fines_to_save):
+                    processed_files.extend(parsed_files)
+                    logger.info("Saved fine data for %s files", len(parsed_files))
                 else:
-                    error_msg = f"Failed to parse {filename}"
-                    errors.append(error_msg)
-                    logger.warning(f"Failed to parse {filename} - no fine number extracted")
-                    ic(error_msg)
+                    for filename in parsed_files:
+                        error_msg = f"Failed to save {filename} to database"
+                        errors.append(error_msg)
+                        logger.error(error_msg)
+            except Exception as e:
+                error_msg = f"Exception while saving scanned files: {e}"
+                errors.append(error_msg)
+                logger.error(ErrorMessageMapper.get_log_message(e, {'folder_path': folder_path}), exc_info=True)
+            parsed_files.clear()
+            fines_to_save.clear()
+        
+        # Unchanged files reuse their earlier parse
+        scanned = self.iter_folder_pdfs(folder_path, workers=workers, cache=get_pdf_cache())
+        for filename, fine_data in scanned:
+            if fine_data and fine_data['fine_number']:
+                parsed_files.append(filename)
+                fines_to_save.append(fine_data)
+                if len(fines_to_save) >= SAVE_BATCH_SIZE:
+                    save_batch()
+            else:
+                error_msg = f"Failed to parse {filename}"
+                errors.append(error_msg)
+                logger.warning("Failed to parse %s - no fine number extracted", filename)
+        
+        if fines_to_save:
+            save_batch()
         
         logger.info(f"Scan complete. Processed: {len(processed_files)}, Errors: {len(errors)}")
-        ic(f"Scan complete. Processed: {len(processed_files)}, Errors: {len(errors)}")
         return {
             'processed': processed_files,
             'errors': errors
@@ -190,4 +323,62 @@ class PDFParser:
         Returns:
             List of jurisdiction names
         """
-        return self.field_config.list_jurisdictions()
\ No newline at end of file
+        return self.field_config.list_jurisdictions()
+
+
+# One parser per worker process, built on its first file
+_process_parser = None
+
+
+def _init_worker(jurisdiction: str, strict_validation: bool) -> None:
+    """Process pool initializer: build the worker's parser before its first task"""
+    global _process_parser
+    _process_parser = PDFParser(jurisdiction, strict_validation)
+
+
+def create_parse_executor(workers: int = PARSE_WORKERS, jurisdiction: str = 'brazil',
+                          strict_validation: bool = False) -> ProcessPoolExecutor:
+    """
+    Create a process pool for parse_pdf_file.
+    
+    Each worker process builds its PDFParser once when it starts and reuses
+    it for every file it is given, so a long-lived pool pays for parser
+    setup once per worker rather than once per scan.
+    
+    Workers are spawned rather than forked: the GUI and the MCP server both
+    create the pool while other threads are running, and a forked child can
+    inherit locks those threads held.
+    
+    Returns:
+        ProcessPoolExecutor; the caller is responsible for shutting it down
+    """
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=_init_worker,
+        initargs=(jurisdiction, strict_validation),
+    )
+
+
+def parse_pdf_file(pdf_path: str, jurisdiction: str = 'brazil', strict_validation: bool = False,
+                   validate: bool = True) -> dict:
+    """
+    Parse a single PDF with a parser owned by the calling process.
+    
+    Module-level so it can be pickled and run in a ProcessPoolExecutor.
+    
+    Args:
+        pdf_path: Path to PDF file
+        jurisdiction: Jurisdiction the parser is built for
+        strict_validation: Strict mode for the parser's validation
+        validate: If True, validate extracted data
+    
+    Returns:
+        Dictionary with extracted fine data or None if parsing fails
+    """
+    global _process_parser
+    if (_process_parser is None
+            or _process_parser.jurisdiction != jurisdiction
+            or _process_parser.strict_validation != strict_validation):
+        _process_parser = PDFParser(jurisdiction, strict_validation)
+    return _process_parser.parse_pdf(pdf_path, validate=validate)
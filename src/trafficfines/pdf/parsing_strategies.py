@@ -4,15 +4,65 @@ Multiple parsing strategies for PDF extraction.
 This module implements different parsing strategies with fallback mechanisms
 to handle various PDF formats and layouts.
 """
+import functools
 import re
 import fitz  # PyMuPDF
 from typing import Dict, List, Optional, Any
 from trafficfines.utils.logger import get_logger
 from trafficfines.utils.helpers import parse_date
-from trafficfines.pdf.field_config import get_field_mapping_config
+from trafficfines.pdf.field_config import DATE_FIELDS, get_field_mapping_config
 
 logger = get_logger(__name__)
 
+# Turns a Brazilian amount such as "R$ 1.234,56" into "1234.56" in one pass:
+# drops the currency symbol, spaces and thousands separators and makes the
+# decimal comma a point
+_AMOUNT_TABLE = str.maketrans({'R': None, '$': None, ' ': None, '.': None, ',': '.'})
+
+
+@functools.lru_cache(maxsize=8)
+def _header_lookup(mapping_items):
+    """
+    Build the structures StructuredParsingStrategy matches header lines with.
+    
+    A line is a header if it starts with one of the mapping's PDF field names,
+    the first such name in mapping order deciding the field. Headers usually
+    appear alone on their line, so those are answered by one dict lookup; the
+    remaining lines are screened with a single startswith over all names
+    before the ordered scan.
+    
+    Args:
+        mapping_items: Tuple of (pdf_field, canonical_key) pairs in mapping order
+    
+    Returns:
+        (exact, prefixes) - dict of header line to canonical key, and the tuple
+        of all PDF field names
+    """
+    exact = {}
+    for pdf_field, _ in mapping_items:
+        exact[pdf_field] = next(key for field, key in mapping_items if pdf_field.startswith(field))
+    return exact, tuple(field for field, _ in mapping_items)
+
+
+@functools.lru_cache(maxsize=8)
+def _field_patterns(mapping_items):
+    """
+    Compile RegexParsingStrategy's field patterns once per mapping.
+    
+    Each pattern is the field name followed by optional separators and the
+    value up to the end of the line.
+    
+    Args:
+        mapping_items: Tuple of (pdf_field, canonical_key) pairs in mapping order
+    
+    Returns:
+        Tuple of (compiled pattern, canonical_key) pairs
+    """
+    return tuple(
+        (re.compile(rf"{re.escape(pdf_field)}\s*[:\-]?\s*([^\n]+)", re.IGNORECASE | re.MULTILINE), canonical_key)
+        for pdf_field, canonical_key in mapping_items
+    )
+
 
 class ParsingStrategy:
     """Base class for parsing strategies."""
@@ -30,6 +80,42 @@ class ParsingStrategy:
             Dictionary with extracted data or None if parsing fails
         """
         raise NotImplementedError
+    
+    def _initialize_fine_data(self, pdf_path: str) -> Dict[str, Any]:
+        """Initialize fine data dictionary with default values."""
+        return {
+            'fine_number': None,
+            'notification_date': None,
+            'defense_due_date': None,
+            'driver_id_due_date': None,
+            'license_plate': None,
+            'vehicle_model': None,
+            'violation_location': None,
+            'violation_date': None,
+            'violation_time': None,
+            'violation_code': None,
+            'amount': 0.0,
+            'description': None,
+            'measured_speed': None,
+            'considered_speed': None,
+            'speed_limit': None,
+            'owner_name': None,
+            'owner_document': None,
+            'pdf_path': pdf_path
+        }
+    
+    def _convert_value(self, key: str, value: str) -> Any:
+        """Convert string value to appropriate type."""
+        if key in DATE_FIELDS:
+            return parse_date(value)
+        elif key == "amount":
+            try:
+                return float(value.translate(_AMOUNT_TABLE))
+            except ValueError:
+                logger.warning(f"Could not parse amount value: {value}")
+                return 0.0
+        else:
+            return value
 
 
 class StructuredParsingStrategy(ParsingStrategy):
@@ -41,7 +127,7 @@ class StructuredParsingStrategy(ParsingStrategy):
     def parse(self, pdf_path: str, text: str, field_mapping: Dict[str, str]) -> Optional[Dict[str, Any]]:
         """Parse using structured line-by-line approach."""
         try:
-            logger.debug(f"Attempting structured parsing for {pdf_path}")
+            logger.debug("Attempting structured parsing for %s", pdf_path)
             
             # Initialize result dictionary
             fine_data = self._initialize_fine_data(pdf_path)
@@ -53,71 +139,40 @@ class StructuredParsingStrategy(ParsingStrategy):
             field_value_pairs = {}
             current_field = None
             
+            mapping_items = tuple(field_mapping.items())
+            exact_headers, prefixes = _header_lookup(mapping_items)
+            
             for line in lines:
                 # Detect field header
-                for pdf_field, canonical_key in field_mapping.items():
-                    if line.startswith(pdf_field):
-                        current_field = canonical_key
-                        field_value_pairs[current_field] = []
-                        break
-                else:
-                    if current_field and not field_value_pairs.get(current_field):
-                        # Only take the first value after the field header
-                        field_value_pairs[current_field].append(line)
+                canonical_key = exact_headers.get(line)
+                if canonical_key is None and line.startswith(prefixes):
+                    canonical_key = next(key for field, key in mapping_items if line.startswith(field))
+                if canonical_key is not None:
+                    current_field = canonical_key
+                    field_value_pairs[current_field] = []
+                elif current_field and not field_value_pairs.get(current_field):
+                    # Only take the first value after the field header
+                    field_value_pairs[current_field].append(line)
             
             # Process the extracted fields
             fine_data = self._process_field_values(fine_data, field_value_pairs)
             
             # Check if we got at least the fine number
             if fine_data.get('fine_number'):
-                logger.debug(f"Structured parsing successful for {pdf_path}")
+                logger.debug("Structured parsing successful for %s", pdf_path)
                 return fine_data
             else:
-                logger.debug(f"Structured parsing failed - no fine number extracted")
+                logger.debug("Structured parsing failed - no fine number extracted")
                 return None
                 
         except Exception as e:
             logger.warning(f"Structured parsing failed: {e}")
             return None
     
-    def _initialize_fine_data(self, pdf_path: str) -> Dict[str, Any]:
-        """Initialize fine data dictionary with default values."""
-        return {
-            'fine_number': None,
-            'notification_date': None,
-            'defense_due_date': None,
-            'driver_id_due_date': None,
-            'license_plate': None,
-            'vehicle_model': None,
-            'violation_location': None,
-            'violation_date': None,
-            'violation_time': None,
-            'violation_code': None,
-            'amount': 0.0,
-            'description': None,
-            'measured_speed': None,
-            'considered_speed': None,
-            'speed_limit': None,
-            'owner_name': None,
-            'owner_document': None,
-            'pdf_path': pdf_path
-        }
-    
     def _process_field_values(self, fine_data: Dict[str, Any], field_value_pairs: Dict[str, List[str]]) -> Dict[str, Any]:
         """Process extracted field values and convert to appropriate types."""
         for key, values in field_value_pairs.items():
-            value = values[0] if values else ''
-            if key in ["notification_date", "defense_due_date", "driver_id_due_date", "violation_date"]:
-                fine_data[key] = parse_date(value)
-            elif key == "amount":
-                try:
-                    amount_str = value.replace("R$", "").replace(".", "").replace(",", ".").strip()
-                    fine_data[key] = float(amount_str)
-                except ValueError:
-                    logger.warning(f"Could not parse amount value: {value}")
-                    fine_data[key] = 0.0
-            else:
-                fine_data[key] = value
+            fine_data[key] = self._convert_value(key, values[0] if values else '')
         
         return fine_data
 
@@ -131,16 +186,13 @@ class RegexParsingStrategy(ParsingStrategy):
     def parse(self, pdf_path: str, text: str, field_mapping: Dict[str, str]) -> Optional[Dict[str, Any]]:
         """Parse using regex patterns."""
         try:
-            logger.debug(f"Attempting regex parsing for {pdf_path}")
+            logger.debug("Attempting regex parsing for %s", pdf_path)
             
             fine_data = self._initialize_fine_data(pdf_path)
             
-            # Try to extract fields using regex patterns
-            for pdf_field, canonical_key in field_mapping.items():
-                # Create regex pattern - field name followed by optional separators and value
-                # Pattern: field_name[separators]value
-                pattern = rf"{re.escape(pdf_field)}\s*[:\-]?\s*([^\n]+)"
-                match = re.search(pattern, text, re.IGNORECASE | re.MULTILINE)
+            # Try to extract fields using the mapping's precompiled patterns
+            for pattern, canonical_key in _field_patterns(tuple(field_mapping.items())):
+                match = pattern.search(text)
                 
                 if match:
                     value = match.group(1).strip()
@@ -149,51 +201,15 @@ class RegexParsingStrategy(ParsingStrategy):
             
             # Check if we got at least the fine number
             if fine_data.get('fine_number'):
-                logger.debug(f"Regex parsing successful for {pdf_path}")
+                logger.debug("Regex parsing successful for %s", pdf_path)
                 return fine_data
             else:
-                logger.debug(f"Regex parsing failed - no fine number extracted")
+                logger.debug("Regex parsing failed - no fine number extracted")
                 return None
                 
         except Exception as e:
             logger.warning(f"Regex parsing failed: {e}")
             return None
-    
-    def _initialize_fine_data(self, pdf_path: str) -> Dict[str, Any]:
-        """Initialize fine data dictionary."""
-        return {
-            'fine_number': None,
-            'notification_date': None,
-            'defense_due_date': None,
-            'driver_id_due_date': None,
-            'license_plate': None,
-            'vehicle_model': None,
-            'violation_location': None,
-            'violation_date': None,
-            'violation_time': None,
-            'violation_code': None,
-            'amount': 0.0,
-            'description': None,
-            'measured_speed': None,
-            'considered_speed': None,
-            'speed_limit': None,
-            'owner_name': None,
-            'owner_document': None,
-            'pdf_path': pdf_path
-        }
-    
-    def _convert_value(self, key: str, value: str) -> Any:
-        """Convert string value to appropriate type."""
-        if key in ["notification_date", "defense_due_date", "driver_id_due_date", "violation_date"]:
-            return parse_date(value)
-        elif key == "amount":
-            try:
-                amount_str = value.replace("R$", "").replace(".", "").replace(",", ".").strip()
-                return float(amount_str)
-            except ValueError:
-                return 0.0
-        else:
-            return value
 
 
 class TableParsingStrategy(ParsingStrategy):
@@ -205,77 +221,50 @@ class TableParsingStrategy(ParsingStrategy):
     def parse(self, pdf_path: str, text: str, field_mapping: Dict[str, str]) -> Optional[Dict[str, Any]]:
         """Parse using table extraction."""
         try:
-            logger.debug(f"Attempting table parsing for {pdf_path}")
+            logger.debug("Attempting table parsing for %s", pdf_path)
             
             fine_data = self._initialize_fine_data(pdf_path)
             
-            # Open PDF to access table structure
-            doc = fitz.open(pdf_path)
-            
-            # Try to find tables in the PDF
-            for page_num, page in enumerate(doc):
-                try:
-                    # Extract tables from page
-                    tables = page.find_tables()
-                    
-                    if tables:
-                        logger.debug(f"Found {len(tables)} tables on page {page_num + 1}")
-                        
-                        # Process each table
-                        for table in tables:
-                            table_data = self._extract_table_data(table, field_mapping)
-                            if table_data:
-                                fine_data.update(table_data)
+            # Open PDF to access table structure; closed on every exit path
+            with fitz.open(pdf_path) as doc:
+                # Try to find tables in the PDF
+                for page_num, page in enumerate(doc):
+                    try:
+                        # Extract tables from page
+                        tables = page.find_tables()
                         
-                        # If we got the fine number, we're done
-                        if fine_data.get('fine_number'):
-                            doc.close()
-                            logger.debug(f"Table parsing successful for {pdf_path}")
-                            return fine_data
-                
-                except Exception as e:
-                    logger.debug(f"Error processing page {page_num + 1} for tables: {e}")
-                    continue
-            
-            doc.close()
+                        if tables:
+                            logger.debug("Found %s tables on page %s", len(tables), page_num + 1)
+                            
+                            # Process each table
+                            for table in tables:
+                                table_data = self._extract_table_data(table, field_mapping)
+                                if table_data:
+                                    fine_data.update(table_data)
+                            
+                            # If we got the fine number, we're done
+                            if fine_data.get('fine_number'):
+                                logger.debug("Table parsing successful for %s", pdf_path)
+                                return fine_data
+                    
+                    except Exception as e:
+                        logger.debug("Error processing page %s for tables: %s", page_num + 1, e)
+                        continue
             
             # If we didn't get fine number, try fallback to text-based table parsing
             fine_data = self._parse_text_table(text, field_mapping, fine_data)
             
             if fine_data.get('fine_number'):
-                logger.debug(f"Text-based table parsing successful for {pdf_path}")
+                logger.debug("Text-based table parsing successful for %s", pdf_path)
                 return fine_data
             
-            logger.debug(f"Table parsing failed - no fine number extracted")
+            logger.debug("Table parsing failed - no fine number extracted")
             return None
             
         except Exception as e:
             logger.warning(f"Table parsing failed: {e}")
             return None
     
-    def _initialize_fine_data(self, pdf_path: str) -> Dict[str, Any]:
-        """Initialize fine data dictionary."""
-        return {
-            'fine_number': None,
-            'notification_date': None,
-            'defense_due_date': None,
-            'driver_id_due_date': None,
-            'license_plate': None,
-            'vehicle_model': None,
-            'violation_location': None,
-            'violation_date': None,
-            'violation_time': None,
-            'violation_code': None,
-            'amount': 0.0,
-            'description': None,
-            'measured_speed': None,
-            'considered_speed': None,
-            'speed_limit': None,
-            'owner_name': None,
-            'owner_document': None,
-            'pdf_path': pdf_path
-        }
-    
     def _extract_table_data(self, table, field_mapping: Dict[str, str]) -> Dict[str, Any]:
         """Extract data from a PyMuPDF table object."""
         data = {}
@@ -323,19 +312,6 @@ class TableParsingStrategy(ParsingStrategy):
                                 break
         
         return fine_data
-    
-    def _convert_value(self, key: str, value: str) -> Any:
-        """Convert string value to appropriate type."""
-        if key in ["notification_date", "defense_due_date", "driver_id_due_date", "violation_date"]:
-            return parse_date(value)
-        elif key == "amount":
-            try:
-                amount_str = value.replace("R$", "").replace(".", "").replace(",", ".").strip()
-                return float(amount_str)
-            except ValueError:
-                return 0.0
-        else:
-            return value
 
 
 class MultiStrategyParser:
@@ -374,11 +350,9 @@ class MultiStrategyParser:
         
         # Extract text from PDF
         try:
-            doc = fitz.open(pdf_path)
-            text = ""
-            for page in doc:
-                text += page.get_text()
-            doc.close()
+            with fitz.open(pdf_path) as doc:
+                # Joined once rather than grown page by page
+                text = "".join([page.get_text("text") for page in doc])
             
             if not text.strip():
                 logger.warning(f"PDF appears to be empty or contains no extractable text: {pdf_path}")
@@ -391,15 +365,15 @@ class MultiStrategyParser:
         # Try each strategy in order
         for i, strategy in enumerate(self.strategies):
             strategy_name = strategy.__class__.__name__
-            logger.debug(f"Trying strategy {i+1}/{len(self.strategies)}: {strategy_name}")
+            logger.debug("Trying strategy %s/%s: %s", i+1, len(self.strategies), strategy_name)
             
             result = strategy.parse(pdf_path, text, field_mapping)
             
             if result and result.get('fine_number'):
-                logger.info(f"Successfully parsed {pdf_path} using {strategy_name}")
+                logger.info("Successfully parsed %s using %s", pdf_path, strategy_name)
                 return result
             else:
-                logger.debug(f"Strategy {strategy_name} did not extract fine number")
+                logger.debug("Strategy %s did not extract fine number", strategy_name)
         
         logger.warning(f"All parsing strategies failed for {pdf_path}")
         return None
@@ -11,6 +11,9 @@ def parse_date(date_str):
     except ValueError:
         return None
 
+# Swaps US-style separators for Brazilian ones in one pass: 1,234.56 -> 1.234,56
+_BRL_SEPARATORS = str.maketrans(',.', '.,')
+
 def format_currency(amount):
     """Format amount as currency string using configured locale settings"""
     if amount is None:
@@ -21,9 +24,7 @@ def format_currency(amount):
     # Brazilian Real formatting: R$ 1.234,56
     if LOCALE['currency'] == 'BRL':
         # Format with thousands separator (.) and decimal comma (,)
-        formatted = f"{amount_float:,.2f}"
-        # Replace comma with placeholder, then dot with comma, then placeholder with dot
-        formatted = formatted.replace(',', 'X').replace('.', ',').replace('X', '.')
+        formatted = f"{amount_float:,.2f}".translate(_BRL_SEPARATORS)
         return f"{LOCALE['currency_symbol']} {formatted}"
     
     # Default USD formatting: $1,234.56
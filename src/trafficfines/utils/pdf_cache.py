@@ -0,0 +1,153 @@
+# utils/pdf_cache.py
+"""
+Disk cache of parsed PDF data.
+
+Parsing a fine PDF takes far longer than a stat call, so the result is kept
+in a small SQLite file keyed by the PDF's path and reused for as long as
+its modification time and size are unchanged and neither the parser (see
+PARSER_VERSION) nor the jurisdiction's field mapping has changed since. Recent entries are also held in memory,
+so repeated lookups in one process skip the database as well.
+"""
+import datetime
+import json
+import os
+import sqlite3
+import threading
+from typing import Optional
+
+from trafficfines.config import PDF_CACHE_FILE
+from trafficfines.pdf.field_config import DATE_FIELDS, PARSER_VERSION, get_field_mapping_config
+from trafficfines.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Entries kept in memory per process; dropped wholesale beyond this size
+MEMORY_CACHE_LIMIT = 512
+
+_CREATE_SQL = '''
+CREATE TABLE IF NOT EXISTS pdf_cache (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    -- jurisdiction@mapping fingerprint, see _parse_tag
+    jurisdiction TEXT NOT NULL,
+    fine_data TEXT NOT NULL
+)
+'''
+_SELECT_SQL = "SELECT mtime_ns, size, jurisdiction, fine_data FROM pdf_cache WHERE path = ?"
+_UPSERT_SQL = '''
+INSERT INTO pdf_cache (path, mtime_ns, size, jurisdiction, fine_data) VALUES (?, ?, ?, ?, ?)
+ON CONFLICT(path) DO UPDATE SET
+    mtime_ns = excluded.mtime_ns,
+    size = excluded.size,
+    jurisdiction = excluded.jurisdiction,
+    fine_data = excluded.fine_data
+'''
+
+
+def _encode(value):
+    """json.dumps hook for dates"""
+    if isinstance(value, datetime.date):
+        return value.isoformat()
+    raise TypeError(f"Cannot cache value of type {type(value).__name__}")
+
+
+def _parse_tag(jurisdiction: str) -> str:
+    """Identify the field mapping a parse used, so mapping edits miss the cache"""
+    return f"{jurisdiction}@{get_field_mapping_config().mapping_fingerprint(jurisdiction)}"
+
+
+class PDFCache:
+    """Parsed fine data keyed by (path, mtime_ns, size), shared between threads."""
+
+    def __init__(self, cache_file: str = PDF_CACHE_FILE):
+        self._lock = threading.Lock()
+        # (mtime_ns, size, jurisdiction, fine_data) by absolute path
+        self._memory = {}
+        self.conn = sqlite3.connect(cache_file, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(_CREATE_SQL)
+        # The file's user_version records the parser that filled it; results
+        # from any other parser version are dropped
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] != PARSER_VERSION:
+            self.conn.execute("DELETE FROM pdf_cache")
+            self.conn.execute(f"PRAGMA user_version = {int(PARSER_VERSION)}")
+        self.conn.commit()
+
+    def get(self, pdf_path: str, jurisdiction: str = 'brazil') -> Optional[dict]:
+        """
+        Return the cached fine data for a PDF, or None on a miss.
+
+        An entry only counts as a hit if the file's mtime and size and the
+        jurisdiction's field mapping still match what was recorded, so edited
+        or replaced files, and files parsed under an older mapping, are
+        parsed again.
+        """
+        try:
+            stat = os.stat(pdf_path)
+        except OSError:
+            return None
+
+        path = os.path.abspath(pdf_path)
+        key = (stat.st_mtime_ns, stat.st_size, _parse_tag(jurisdiction))
+        entry = self._memory.get(path)
+        if entry is not None and entry[:3] == key:
+            # Copied so callers cannot change the cached entry
+            return dict(entry[3])
+        
+        with self._lock:
+            row = self.conn.execute(_SELECT_SQL, (path,)).fetchone()
+        if row is None or row[:3] != key:
+            return None
+
+        fine_data = json.loads(row[3])
+        # JSON stores the parser's date fields as ISO 8601 text
+        for field in DATE_FIELDS:
+            if fine_data.get(field):
+                fine_data[field] = datetime.date.fromisoformat(fine_data[field])
+        self._remember(path, key, fine_data)
+        return dict(fine_data)
+
+    def put(self, pdf_path: str, fine_data: dict, jurisdiction: str = 'brazil') -> None:
+        """Store the fine data parsed from a PDF; failures are only logged."""
+        try:
+            stat = os.stat(pdf_path)
+            row = (
+                os.path.abspath(pdf_path), stat.st_mtime_ns, stat.st_size,
+                _parse_tag(jurisdiction), json.dumps(fine_data, default=_encode)
+            )
+            with self._lock:
+                self.conn.execute(_UPSERT_SQL, row)
+                self.conn.commit()
+            self._remember(row[0], row[1:4], dict(fine_data))
+        except (OSError, TypeError, sqlite3.Error) as e:
+            logger.warning(f"Could not cache parsed data for {pdf_path}: {e}")
+    
+    def _remember(self, path: str, key: tuple, fine_data: dict) -> None:
+        """Keep an entry in the in-memory layer"""
+        if len(self._memory) >= MEMORY_CACHE_LIMIT:
+            self._memory.clear()
+        self._memory[path] = key + (fine_data,)
+
+
+# Global instance for easy access
+_default_cache: Optional[PDFCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_pdf_cache() -> PDFCache:
+    """
+    Get or create the shared PDF cache instance.
+
+    Returns:
+        PDFCache instance
+    """
+    global _default_cache
+
+    if _default_cache is None:
+        with _default_cache_lock:
+            if _default_cache is None:
+                _default_cache = PDFCache()
+
+    return _default_cache